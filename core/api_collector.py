@@ -8,6 +8,8 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Callable
 import threading
 
+from .data_combiner import DataCombiner
+
 # --- Configurações (estas podem ser globais se a classe as acessa) ---
 API_BASE_URL = "https://api-minipreco-inventario-hades.onrender.com"
 # MUITO IMPORTANTE: Verifique se este TOKEN está COMPLETO e CORRETO.
@@ -146,48 +148,58 @@ class ApiCollector:
             self.logger.info("Nenhum registro da API para processar neste ciclo.")
             return last_processed_ts
 
-        new_records_from_api = []
+        # Colunas acumuladas separadamente (uma lista por campo mapeado), prontas para
+        # montar o DataFrame sem transpor uma lista de dicionários
+        new_columns: Dict[str, list] = {api_key: [] for api_key in self.column_mapping}
+        new_count = 0
         current_batch_latest_ts = last_processed_ts
 
         for record in api_records:
-            try:
-                ts_str = record.get('horario_recebimento_api') or record.get('horario')
-                if not ts_str:
-                    self.logger.warning(f"Registro da API sem timestamp, ignorado: {record}")
-                    continue
+            # 1. Filtra pela loja_key correta antes de qualquer conversão:
+            #    registros de outras lojas são descartados com uma comparação simples
+            if record.get('loja_key') != self.loja_key:
+                continue
+
+            ts_str = record.get('horario_recebimento_api') or record.get('horario')
+            if not ts_str:
+                self.logger.warning(f"Registro da API sem timestamp, ignorado: {record}")
+                continue
 
+            try:
                 record_ts = datetime.fromisoformat(ts_str).astimezone(timezone.utc)
-                
-                # 1. Filtra pela loja_key correta (esta lógica permanece)
-                if record.get('loja_key') != self.loja_key:
-                    continue 
+            except (TypeError, ValueError) as e:
+                self.logger.warning(f"Ignorando registro da API por timestamp inválido: {record}. Erro: {e}")
+                continue
 
-                # 2. Filtra por registros que ainda não foram processados (mais novos que o último timestamp salvo)
-                # Esta parte garante que processamos apenas dados que são realmente 'novos' em termos de timestamp da API.
-                if last_processed_ts is None or record_ts > last_processed_ts:
-                    new_records_from_api.append(record)
-                    # Atualiza o timestamp mais recente encontrado NESTE LOTE de novos registros
-                    if current_batch_latest_ts is None or record_ts > current_batch_latest_ts:
-                        current_batch_latest_ts = record_ts
-            except Exception as e:
-                self.logger.warning(f"Ignorando registro da API por erro de processamento (timestamp ou loja_key): {record}. Erro: {e}")
+            # 2. Filtra por registros que ainda não foram processados (mais novos que o último timestamp salvo)
+            # Esta parte garante que processamos apenas dados que são realmente 'novos' em termos de timestamp da API.
+            if last_processed_ts is None or record_ts > last_processed_ts:
+                for api_key, values in new_columns.items():
+                    values.append(record.get(api_key, ''))
+                new_count += 1
+                # Atualiza o timestamp mais recente encontrado NESTE LOTE de novos registros
+                if current_batch_latest_ts is None or record_ts > current_batch_latest_ts:
+                    current_batch_latest_ts = record_ts
 
-        if not new_records_from_api:
+        if not new_count:
             self.logger.info(f"Nenhum registro NOVO da API encontrado para a loja {self.loja_key} desde a última coleta.")
             return last_processed_ts
 
-        self.logger.info(f"Processando {len(new_records_from_api)} registros NOVOS da API para a loja {self.loja_key}.")
-        df_new_api_data = pd.DataFrame(new_records_from_api).rename(columns=self.column_mapping)
+        self.logger.info(f"Processando {new_count} registros NOVOS da API para a loja {self.loja_key}.")
+        # Todas as colunas mapeadas existem; campos ausentes no registro chegam como ''
+        df_new_api_data = pd.DataFrame(
+            {self.column_mapping[api_key]: values for api_key, values in new_columns.items()}
+        )
         
-        # Garante que todas as colunas mapeadas existam no DataFrame recém-criado
-        for col in self.column_mapping.values():
-            if col not in df_new_api_data.columns:
-                df_new_api_data[col] = '' # Ou 0 para QNT_CONTADA, dependendo do default
+        # Códigos numéricos com nulos chegam como float64; grava sempre como texto GTIN-13
+        df_new_api_data['COD_BARRAS'] = DataCombiner.standardize_barcode(df_new_api_data['COD_BARRAS'])
         
         try:
             df_existing = pd.DataFrame()
             if self.output_file.exists():
                 df_existing = pd.read_parquet(self.output_file)
+                if 'COD_BARRAS' in df_existing.columns:
+                    df_existing['COD_BARRAS'] = DataCombiner.standardize_barcode(df_existing['COD_BARRAS'])
                 self.logger.info(f"Carregado {len(df_existing)} registros existentes de {self.output_file.name}.")
             
             # --- LÓGICA CHAVE PARA ATUALIZAÇÃO E SUBSTITUIÇÃO ---
@@ -1,4 +1,5 @@
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 import time
 from typing import Optional, Dict, List, Callable, Any # [CITE: 1] <-- Adicione Any para tipagem flexível
@@ -26,6 +27,9 @@ class DataCombiner:
         self.backup_file = self.data_folder / "combined_data.bak"
         self.temp_file = self.data_folder / "combined_data.tmp"
 
+        # Assinatura dos arquivos de origem da última combinação salva (evita regravar sem mudanças)
+        self._last_source_signature: Optional[tuple] = None
+
         self.max_retries = 3
         self.retry_delay = 1
         
@@ -37,18 +41,26 @@ class DataCombiner:
         self.logger.info(f"DataCombiner configurado para a pasta: {self.data_folder}")
 
     ### CORREÇÃO PRINCIPAL 1: NOVO MÉTODO DE PADRONIZAÇÃO ###
-    def _standardize_barcode(self, series: pd.Series) -> pd.Series:
+    @staticmethod
+    def standardize_barcode(series: pd.Series) -> pd.Series:
         """
         Aplica uma limpeza rigorosa e padroniza uma série de códigos de barra para o formato GTIN-13.
         Esta é a função chave para garantir que o merge funcione corretamente.
+        Os produtores (FileProcessor) já gravam os códigos neste formato; nesse caso a série
+        é devolvida sem nenhuma conversão adicional.
         """
-        # [CITE: 1] Adicionado .fillna('') para garantir que nulos sejam tratados como strings vazias antes da limpeza.
+        # Caminho rápido: a série já está padronizada, evita reconverter a coluna a cada combinação
+        if (pd.api.types.is_string_dtype(series) and series.notna().all()
+                and series.str.fullmatch(r'\d{13}').all()):
+            return series
+        
         return (
-            series.astype(str)                               # 1. Garante que tudo é texto
-            .fillna('')                                      # 1.5. Trata NaN como string vazia
-            .str.strip()                                     # 2. Remove espaços em branco no início e fim
-            .str.replace(r'\D', '', regex=True)              # 3. Remove QUALQUER caractere que não seja um dígito
-            .str.zfill(13)                                   # 4. Adiciona zeros à esquerda para completar 13 dígitos
+            series.fillna('')                                # 1. Trata NaN como string vazia
+            .astype(str)                                     # 2. Garante que tudo é texto
+            .str.strip()                                     # 3. Remove espaços em branco no início e fim
+            .str.replace(r'\.0$', '', regex=True)            # 4. Remove o '.0' de códigos que viraram float (ex.: JSON/Excel com nulos)
+            .str.replace(r'\D', '', regex=True)              # 5. Remove QUALQUER caractere que não seja um dígito
+            .str.zfill(13)                                   # 6. Adiciona zeros à esquerda para completar 13 dígitos
         )
 
     def set_update_callback(self, callback: Callable[[], None]):
@@ -63,13 +75,19 @@ class DataCombiner:
             self.logger.critical(f"Falha ao acessar ou criar a pasta de dados: {e}")
             raise PermissionError(f"Não foi possível acessar a pasta {self.data_folder}") from e
 
-    def _safe_read_parquet(self, path: Path) -> Optional[pd.DataFrame]:
+    def _safe_read_parquet(self, path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Lê um parquet direto pelo pyarrow (arquivo mapeado em memória), carregando apenas
+        as colunas pedidas que existirem no arquivo. O DataFrame retornado já é independente
+        do arquivo, sem necessidade de cópia extra.
+        """
         if not path.exists(): return None
         for attempt in range(self.max_retries):
             try:
-                # [CITE: 1] Adicionado try-except para o .copy() também, mais defensivo
-                df = pd.read_parquet(path, engine='pyarrow')
-                return df.copy()
+                if columns is not None:
+                    available = set(pq.read_schema(path).names)
+                    columns = [col for col in columns if col in available]
+                return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
             except Exception as e:
                 self.logger.warning(f"Tentativa {attempt + 1} de ler {path.name} falhou: {e}")
                 if attempt == self.max_retries - 1:
@@ -80,7 +98,7 @@ class DataCombiner:
 
     def _load_initial_data(self) -> Optional[pd.DataFrame]:
         initial_path = self.data_folder / "initial_data.parquet"
-        df = self._safe_read_parquet(initial_path)
+        df = self._safe_read_parquet(initial_path, columns=self.initial_columns)
         
         if df is None:
             self.logger.warning("Arquivo de dados inicial 'initial_data.parquet' não encontrado. Retornando DataFrame vazio.")
@@ -96,9 +114,9 @@ class DataCombiner:
             # É crucial que o GTIN na base inicial esteja padronizado para o merge funcionar.
             # Se 'GTIN' não existe ou não está em string, este ajuste garante a padronização.
             if 'GTIN' in df.columns: # [CITE: 1] Adicionado para verificar se a coluna existe
-                df['GTIN'] = self._standardize_barcode(df['GTIN'])
+                df['GTIN'] = self.standardize_barcode(df['GTIN'])
             else: # [CITE: 1] Se 'GTIN' não existe, crie-a como string vazia padronizada.
-                df['GTIN'] = self._standardize_barcode(pd.Series([''])) # Cria uma série vazia e padroniza
+                df['GTIN'] = self.standardize_barcode(pd.Series([''])) # Cria uma série vazia e padroniza
             
             df['Codigo'] = df['Codigo'].astype(str).str.strip()
             for col in ['Preco', 'Estoque', 'Custo']:
@@ -117,11 +135,11 @@ class DataCombiner:
         for filename in self.static_count_files:
             file_path = self.data_folder / filename
             if file_path.exists():
-                df_source = self._safe_read_parquet(file_path)
+                df_source = self._safe_read_parquet(file_path, columns=self.count_columns)
                 if df_source is not None and not df_source.empty:
                     # [CITE: 1] ADIÇÃO: Padroniza COD_BARRAS para todos os arquivos de contagem
                     if 'COD_BARRAS' in df_source.columns:
-                        df_source['COD_BARRAS'] = self._standardize_barcode(df_source['COD_BARRAS'])
+                        df_source['COD_BARRAS'] = self.standardize_barcode(df_source['COD_BARRAS'])
                     else: # [CITE: 1] Se 'COD_BARRAS' não existe, loga e pula ou cria coluna vazia
                         self.logger.warning(f"Coluna 'COD_BARRAS' não encontrada em {filename}. Pulando este arquivo de contagem.")
                         continue # Pula este arquivo se a chave principal não existe
@@ -130,11 +148,11 @@ class DataCombiner:
         # [CITE: 1] Carrega arquivos de contagem dinâmicos (e.g., contagem_*.parquet)
         for pattern in self.dynamic_count_patterns:
             for file_path in self.data_folder.glob(pattern):
-                df_source = self._safe_read_parquet(file_path)
+                df_source = self._safe_read_parquet(file_path, columns=self.count_columns)
                 if df_source is not None and not df_source.empty:
                     # [CITE: 1] ADIÇÃO: Padroniza COD_BARRAS para todos os arquivos de contagem
                     if 'COD_BARRAS' in df_source.columns:
-                        df_source['COD_BARRAS'] = self._standardize_barcode(df_source['COD_BARRAS'])
+                        df_source['COD_BARRAS'] = self.standardize_barcode(df_source['COD_BARRAS'])
                     else: # [CITE: 1] Se 'COD_BARRAS' não existe, loga e pula ou cria coluna vazia
                         self.logger.warning(f"Coluna 'COD_BARRAS' não encontrada em {file_path.name}. Pulando este arquivo de contagem.")
                         continue # Pula este arquivo se a chave principal não existe
@@ -193,6 +211,7 @@ class DataCombiner:
                 return df_initial[self.final_columns]
 
             # [CITE: 1] O merge agora funcionará corretamente porque os GTINs (e LOJA_KEY se for usada) estão padronizados
+            # Ambas as chaves são texto GTIN-13: o join é feito por hash de string, nunca por float
             # Usa 'GTIN' e 'LOJA_KEY' (se disponível nos dois) para um merge mais preciso
             
             # [CITE: 1] Prepara chaves de merge
@@ -238,9 +257,38 @@ class DataCombiner:
             self.logger.error(f"Erro ao preparar dados finais: {e}", exc_info=True)
             return None
     
-    def combine_data(self) -> bool:
+    def _source_signature(self) -> tuple:
+        """Retorna (nome, mtime, tamanho) de cada arquivo de origem usado na combinação."""
+        paths = [self.data_folder / "initial_data.parquet"]
+        paths.extend(self.data_folder / filename for filename in self.static_count_files)
+        for pattern in self.dynamic_count_patterns:
+            paths.extend(sorted(self.data_folder.glob(pattern)))
+        
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def combine_data(self, force: bool = False) -> bool:
+        """
+        Combina os dados iniciais com as contagens e salva o arquivo combinado.
+        
+        Args:
+            force (bool): Recombina mesmo que nenhum arquivo de origem tenha mudado
+                desde a última combinação salva.
+        """
         with self.lock: # [CITE: 1] O lock já está no lugar, garantindo thread-safety
             try:
+                signature = self._source_signature()
+                if (not force and signature == self._last_source_signature
+                        and self.combined_file.exists()):
+                    self.logger.debug("Nenhuma alteração nos arquivos de origem. Combinação ignorada.")
+                    return True
+                
                 self.logger.info("Iniciando processo de combinação de dados...")
                 df_initial = self._load_initial_data()
                 if df_initial is None: 
@@ -262,6 +310,7 @@ class DataCombiner:
                     return False
                 
                 if self._save_combined_data(final_df):
+                    self._last_source_signature = signature
                     self.logger.info("Processo de combinação de dados concluído com sucesso.")
                     if self._update_callback:
                         # [CITE: 1] O callback é executado aqui para notificar a UI.
@@ -1,11 +1,16 @@
 # core/file_processor.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Iterator, List
 import logging
 import chardet
-import threading
 import shutil
 from datetime import datetime # Importar datetime
 
@@ -13,23 +18,28 @@ from .data_combiner import DataCombiner
 
 
 class FileProcessor:
+    # Expressão regular de uma linha do TXT inicial, compilada uma única vez.
+    # Ancorada nas duas pontas: extrai os 7 campos em uma só passada pela linha,
+    # sem gerar lista de tokens (split) nem reconstruir a descrição (join).
+    LINE_RE = re.compile(
+        r'^(?P<gtin>\d{13})\s+'
+        r'(?P<codigo>\d{9})\s+'
+        r'(?P<descricao>.+?)\s+'
+        r'(?P<preco>\d{8})\s+'
+        r'(?P<estoque>\d{8})\s+'
+        r'(?P<custo>\d{8})\s+'
+        r'(?P<secao>\d{5})$'
+    )
+    # Qualquer caractere que não seja dígito (normalização de códigos)
+    NON_DIGIT_RE = re.compile(r'\D')
+    # Tamanho (em bytes) de cada bloco do TXT lido por vez no parsing
+    TXT_BLOCK_SIZE = 16 << 20
+    # Buffer (em bytes) da escrita do parquet gerado a partir do TXT
+    OUTPUT_BUFFER_SIZE = 1 << 20
+
     def __init__(self, inventory_manager):
         self.inventory_manager = inventory_manager
         self.logger = logging.getLogger(__name__)
-        
-        # Mapeamento de colunas do Excel (Este mapeamento é para a "limpeza" de dados, não para o process_excel inicial)
-        # Manter este mapeamento se for usado em outras partes do seu FileProcessor
-        self.excel_column_mapping = {
-            'GTIN': ['gtin', 'ean', 'código de barras', 'barcode'],
-            'Codigo': ['codigo', 'código', 'id', 'produto', 'sku'],
-            'Descricao': ['descricao', 'descrição', 'nome', 'produto'],
-            'Preco': ['preco', 'preço', 'valor', 'preço de venda'],
-            'Estoque': ['estoque', 'quantidade', 'qtd', 'saldo'],
-            'Custo': ['custo', 'custo unitário', 'preço de custo'],
-            'Secao': ['secao', 'seção', 'departamento', 'categoria'],
-            'Endereco': ['endereco', 'endereço', 'local', 'posição'],
-            'Operador': ['operador', 'funcionário', 'responsável']
-        }
 
     @staticmethod
     def detect_encoding(file_path: str) -> Optional[str]:
@@ -45,16 +55,17 @@ class FileProcessor:
             logging.warning(f"Falha ao detectar encoding: {e}")
             return 'utf-8'
 
-    def _remove_leading_zeros(self, value: str) -> str:
-        """Remove zeros à esquerda de uma string numérica."""
-        # Garante que a entrada é uma string antes de chamar lstrip
-        s_value = str(value)
-        return s_value.lstrip('0') or '0'
+    @staticmethod
+    def _remove_leading_zeros(series: pd.Series) -> pd.Series:
+        """Remove zeros à esquerda de uma coluna de strings numéricas (vetorizado)."""
+        # Garante que a entrada é texto antes de chamar lstrip; valores só com zeros viram '0'
+        stripped = series.astype(str).str.lstrip('0')
+        return stripped.mask(stripped == '', '0')
 
-    def _add_flag_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _load_flag_map(self) -> Optional[pd.Series]:
         """
-        Faz o join do DataFrame processado com o arquivo `prod_flag.parquet`.
-        Adiciona a coluna `Flag` com base no arquivo `prod_flag.parquet`.
+        Carrega o arquivo `prod_flag.parquet` uma única vez e devolve a flag de cada produto,
+        indexada pelo código normalizado. Retorna None se o arquivo não puder ser usado.
         """
         try:
             # Caminho para o arquivo prod_flag.parquet
@@ -63,8 +74,7 @@ class FileProcessor:
 
             if not flag_file.exists():
                 self.logger.warning("Arquivo 'prod_flag.parquet' não encontrado. Flags não serão adicionadas.")
-                df['Flag'] = ''  # Adiciona coluna vazia se arquivo não existir
-                return df
+                return None
 
             # Carrega o arquivo prod_flag.parquet
             flag_df = pd.read_parquet(flag_file)
@@ -73,49 +83,35 @@ class FileProcessor:
             required_columns = {'produto_key', 'flag'}
             if not required_columns.issubset(flag_df.columns):
                 self.logger.error(f"Colunas obrigatórias {required_columns} ausentes no arquivo 'prod_flag.parquet'. Flags não serão adicionadas.")
-                df['Flag'] = ''
-                return df
+                return None
+
+            flag_map = flag_df['flag'].set_axis(self._normalize_code(flag_df['produto_key']))
+            return flag_map[~flag_map.index.duplicated()]
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar flags: {e}", exc_info=True)
+            return None
 
-            # Pré-processamento - Normalização das chaves
-            def normalize_code(code: Any) -> str: # Tipo alterado para Any para lidar com nulos/números
-                """Remove todos os não-dígitos e zeros à esquerda"""
-                if pd.isna(code):
-                    return ''
-                return ''.join(filter(str.isdigit, str(code))).lstrip('0') or '0'
+    def _normalize_code(self, codes: pd.Series) -> pd.Series:
+        """Remove todos os não-dígitos e zeros à esquerda (vetorizado); nulos viram ''"""
+        digits = codes.astype(str).str.replace(self.NON_DIGIT_RE, '', regex=True)
+        return self._remove_leading_zeros(digits).mask(codes.isna(), '')
 
-            # Aplica normalização
+    def _add_flag_data(self, df: pd.DataFrame, flag_map: Optional[pd.Series]) -> pd.DataFrame:
+        """
+        Adiciona a coluna `Flag` ao DataFrame processado, buscando o código normalizado
+        no mapa carregado de `prod_flag.parquet` (ver _load_flag_map).
+        """
+        if flag_map is None:
+            df['Flag'] = ''
+            return df
+        try:
             # Certifica-se que 'Codigo' existe antes de normalizar
-            if 'Codigo' in df.columns:
-                df['Codigo_normalized'] = df['Codigo'].apply(normalize_code)
-            else:
+            if 'Codigo' not in df.columns:
                 self.logger.warning("Coluna 'Codigo' não encontrada no DataFrame principal para aplicar flags.")
                 df['Flag'] = ''
                 return df
-            
-            flag_df['produto_key_normalized'] = flag_df['produto_key'].apply(normalize_code)
-
-            # Faz o join apenas pelo código normalizado
-            merged_df = pd.merge(
-                df,
-                flag_df[['produto_key_normalized', 'flag']],
-                how='left',
-                left_on=['Codigo_normalized'],
-                right_on=['produto_key_normalized']
-            )
-
-            # Adiciona a coluna Flag e remove colunas temporárias
-            df['Flag'] = merged_df['flag'].fillna('')
-            df.drop(columns=['Codigo_normalized'], inplace=True, errors='ignore') # erro ignore para compatibilidade
-
-            # Estatísticas
-            flagged_count = (df['Flag'] != '').sum()
-            self.logger.info(f"Flags aplicadas em {flagged_count} de {len(df)} produtos ({(flagged_count/len(df))*100:.2f}%)")
-            
-            # Debug: mostra exemplos de matches
-            if flagged_count > 0:
-                sample_matches = df[df['Flag'] != ''].head(3)[['Codigo', 'Flag']]
-                self.logger.debug(f"Exemplos de matches:\n{sample_matches.to_string()}")
-            
+
+            df['Flag'] = self._normalize_code(df['Codigo']).map(flag_map).fillna('')
             return df
 
         except Exception as e:
@@ -123,8 +119,100 @@ class FileProcessor:
             df['Flag'] = ''
             return df
 
+    def _parse_txt_stream(self, file_path: str, encoding: str) -> Iterator[Tuple[pd.DataFrame, int, list]]:
+        """
+        Lê o TXT em blocos pelo leitor CSV do Arrow (C++), tratando cada linha como um
+        único campo, e aplica o regex a cada bloco com o motor RE2 do Arrow, sem passar
+        as linhas por objetos Python. Mantém em memória apenas um bloco de texto por vez.
+        Para cada bloco, produz os campos extraídos, o total de linhas inválidas e uma
+        amostra (até 10) dos números dessas linhas.
+        """
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(column_names=['linha'], encoding=encoding,
+                                           block_size=self.TXT_BLOCK_SIZE),
+            # Delimitador que não ocorre no arquivo e sem aspas: a linha inteira é o campo.
+            # Linhas vazias são mantidas para que a posição no bloco seja o número da linha.
+            parse_options=pacsv.ParseOptions(delimiter='\x01', quote_char=False,
+                                             escape_char=False, ignore_empty_lines=False),
+            convert_options=pacsv.ConvertOptions(column_types={'linha': pa.string()},
+                                                 strings_can_be_null=False),
+        )
+
+        line_offset = 0
+        for batch in reader:
+            lines = pc.utf8_trim_whitespace(batch.column(0))
+            fields = pc.extract_regex(lines, self.LINE_RE.pattern)
+            valid = fields.is_valid()
+
+            # Linhas em branco são ignoradas sem aviso; as demais sem match são inválidas
+            invalid = pc.and_(pc.invert(valid), pc.not_equal(lines, ''))
+            block_invalid = pc.sum(invalid).as_py() or 0
+            invalid_sample = []
+            if block_invalid:
+                positions = pc.indices_nonzero(invalid)[:10]
+                invalid_sample = [line_offset + i + 1 for i in positions.to_pylist()]
+            line_offset += batch.num_rows
+
+            parsed = pa.RecordBatch.from_struct_array(fields.filter(valid)).to_pandas()
+            yield parsed, block_invalid, invalid_sample
+
+    def _build_initial_frame(self, parsed: pd.DataFrame, flag_map: Optional[pd.Series]) -> pd.DataFrame:
+        """Converte os campos extraídos de um bloco do TXT no formato de initial_data"""
+        # Os campos numéricos têm 8 dígitos fixos (garantido pelo regex) e 2 casas decimais implícitas
+        df = pd.DataFrame({
+            # O GTIN já tem 13 dígitos: grava no formato padrão esperado pelo DataCombiner
+            'GTIN': parsed['gtin'],
+            'Codigo': self._remove_leading_zeros(parsed['codigo']),
+            'Descricao': parsed['descricao'].str.strip(),
+            'Preco': parsed['preco'].astype('int64') / 100,
+            'Estoque': parsed['estoque'].astype('int64') / 100,
+            'Custo': parsed['custo'].astype('int64') / 100,
+            'Secao': self._remove_leading_zeros(parsed['secao']),
+        })
+        df = self._add_flag_data(df, flag_map)
+
+        columns_order = ['GTIN', 'Codigo', 'Descricao', 'Preco', 'Estoque',
+                         'Custo', 'Secao', 'Flag']
+        return df[columns_order]
+
+    def _convert_txt_to_parquet(self, file_path: str, encoding: str, flag_map: Optional[pd.Series],
+                                output_path: Path) -> Tuple[int, int, int, list]:
+        """
+        Converte o TXT em parquet bloco a bloco: cada bloco analisado recebe as flags e é
+        gravado imediatamente, sem acumular a tabela inteira em memória.
+        Retorna (linhas gravadas, linhas com flag, linhas inválidas, amostra de inválidas).
+        """
+        writer = None
+        rows = flagged = invalid_count = 0
+        invalid_sample = []
+        # Saída com buffer explícito: as páginas do parquet chegam ao disco em poucas escritas grandes
+        with pa.output_stream(str(output_path), buffer_size=self.OUTPUT_BUFFER_SIZE) as sink:
+            try:
+                for parsed, block_invalid, block_sample in self._parse_txt_stream(file_path, encoding):
+                    invalid_count += block_invalid
+                    invalid_sample.extend(block_sample[:10 - len(invalid_sample)])
+                    if parsed.empty:
+                        continue
+
+                    df = self._build_initial_frame(parsed, flag_map)
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    if writer is None:
+                        # LZ4 grava tão rápido quanto o snappy padrão e descomprime bem mais rápido;
+                        # este arquivo é relido a cada combinação de dados
+                        writer = pq.ParquetWriter(sink, table.schema, compression='lz4')
+                    writer.write_table(table)
+
+                    rows += len(df)
+                    flagged += int((df['Flag'] != '').sum())
+            finally:
+                if writer is not None:
+                    writer.close()
+        return rows, flagged, invalid_count, invalid_sample
+
     def process_initial_txt(self, file_path: str) -> Tuple[bool, str]:
         """Processa o arquivo TXT inicial e salva como parquet"""
+        temp_path = None
         try:
             # [CITE: 3] Este é o _get_active_data_path que havíamos discutido
             data_path = Path(self.inventory_manager.get_active_inventory_data_path())
@@ -134,185 +222,69 @@ class FileProcessor:
             # Garante que a pasta existe
             data_path.mkdir(parents=True, exist_ok=True)
 
+            output_path = data_path / "initial_data.parquet"
+            # Grava em arquivo temporário e só substitui o initial_data ao final com sucesso
+            temp_path = data_path / "initial_data.parquet.tmp"
+            flag_map = self._load_flag_map()
+
             # Detecta a codificação do arquivo TXT
             encodings_to_try = [self.detect_encoding(file_path), 'utf-8', 'latin-1']
-            lines = []
+            result = None
 
             for encoding in filter(None, set(encodings_to_try)):
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        lines = f.readlines()
+                    result = self._convert_txt_to_parquet(file_path, encoding, flag_map, temp_path)
                     break
-                except UnicodeDecodeError:
+                except (UnicodeDecodeError, pa.ArrowInvalid):
+                    # Bytes inválidos para a codificação (ou arquivo vazio): tenta a próxima
                     continue
 
-            if not lines:
+            if result is None:
                 return False, "Não foi possível ler o arquivo."
 
-            # Expressão regular para parsing
-            pattern = re.compile(
-                r'^(?P<gtin>\d{13})\s+'
-                r'(?P<codigo>\d{9})\s+'
-                r'(?P<descricao>.+?)\s+'
-                r'(?P<preco>\d{8})\s+'
-                r'(?P<estoque>\d{8})\s+'
-                r'(?P<custo>\d{8})\s+'
-                r'(?P<secao>\d{5})$'
-            )
-
-            data = []
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:
-                    continue
-
-                match = pattern.match(line)
-                if not match:
-                    self.logger.warning(f"Linha {line_num} ignorada: formato inválido.")
-                    continue
+            rows, flagged_count, invalid_count, invalid_sample = result
+            if invalid_count:
+                self.logger.warning(f"{invalid_count} linha(s) ignorada(s): formato inválido. "
+                                    f"Primeiras: {invalid_sample}")
 
-                try:
-                    # Capture os valores como string
-                    preco_str = match.group('preco')
-                    estoque_str = match.group('estoque')
-                    custo_str = match.group('custo')
-                    
-                    # Remova qualquer vírgula ou ponto (que não seja decimal) antes de converter para int
-                    # Embora o regex \d{8} não permita vírgulas/pontos, o .replace(r'[.,]', '') serve como segurança.
-                    # O principal aqui é a divisão por 100.
-                    preco_limpo = re.sub(r'[.,]', '', preco_str)
-                    estoque_limpo = re.sub(r'[.,]', '', estoque_str)
-                    custo_limpo = re.sub(r'[.,]', '', custo_str)
-                    
-                    data.append({
-                        'GTIN': self._remove_leading_zeros(match.group('gtin')),
-                        'Codigo': self._remove_leading_zeros(match.group('codigo')),
-                        'Descricao': match.group('descricao').strip(),
-                        # CORREÇÃO APLICADA: Divide por 100 para Preco
-                        'Preco': int(preco_limpo) / 100,
-                        # CORREÇÃO APLICADA: Divide por 100 para Estoque
-                        'Estoque': int(estoque_limpo) / 100,
-                        # CORREÇÃO APLICADA: Divide por 100 para Custo
-                        'Custo': int(custo_limpo) / 100,
-                        'Secao': self._remove_leading_zeros(match.group('secao')),
-                    })
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar linha {line_num}: {e}")
-
-            if not data:
+            if not rows:
                 return False, "Nenhum dado válido encontrado."
 
-            df = pd.DataFrame(data)
-            df = self._add_flag_data(df)
-
-            columns_order = ['GTIN', 'Codigo', 'Descricao', 'Preco', 'Estoque',
-                             'Custo', 'Secao', 'Flag']
-            df = df[columns_order]
+            self.logger.info(f"Flags aplicadas em {flagged_count} de {rows} produtos ({(flagged_count/rows)*100:.2f}%)")
 
             # Salva os dados processados
-            output_path = data_path / "initial_data.parquet"
-            df.to_parquet(output_path, index=False)
-            
-            # [CITE: 3] REMOVA ESTE BLOCO - A combinação será disparada pelo DataCombiner
-            # combiner = DataCombiner(data_path)
-            # combiner.combine_data()
+            temp_path.replace(output_path)
             
-            return True, f"Arquivo processado com sucesso. {len(data)} itens importados."
+            return True, f"Arquivo processado com sucesso. {rows} itens importados."
         except Exception as e:
             self.logger.error(f"Erro ao processar TXT: {e}", exc_info=True)
             return False, f"Erro crítico: {str(e)}"
+        finally:
+            if temp_path is not None and temp_path.exists():
+                temp_path.unlink()
     
-    # [CITE: 3] REMOVA ESTE MÉTODO - A combinação será disparada pelo DataCombiner
-    # def _trigger_data_combination(self, data_path: str) -> bool:
-    #     """Dispara a combinação de dados"""
-    #     try:
-    #         return DataCombiner(data_path).combine_data()
-    #     except Exception as e:
-    #         self.logger.error(f"Falha na combinação automática: {e}", exc_info=True)
-    #         return False
-            
-    def _map_excel_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Mapeia as colunas EXATAS do seu Excel para o formato interno"""
-        # [CITE: 3] Esta função será modificada e movida/integrada diretamente ao process_excel
-        # para a nova lógica. O mapeamento será feito direto na função process_excel.
-        # Por enquanto, vou deixá-la aqui, mas o process_excel não vai usá-la como está.
-        mapped_df = pd.DataFrame()
-        
-        # Mapeamento ESPECÍFICO para seus arquivos
-        column_mapping = {
-            'GTIN': ['CÓD. BARRAS', 'COD. BARRAS', 'CODIGO BARRAS'],
-            'Operador': ['OPERADOR'],
-            'Endereco': ['ENDEREÇO', 'ENDERECO'],
-            'Estoque': ['QNT. CONTADA', 'QUANTIDADE CONTADA', 'QNT CONTADA']
-        }
-        
-        # Verifica cada coluna necessária
-        for standard_col, possible_names in column_mapping.items():
-            found = False
-            for possible_name in possible_names:
-                if possible_name in df.columns:
-                    mapped_df[standard_col] = df[possible_name]
-                    self.logger.debug(f"Mapeada coluna '{possible_name}' -> '{standard_col}'")
-                    found = True
-                    break
-            
-            if not found and standard_col in ['Endereco', 'Operador']:
-                mapped_df[standard_col] = None  # Colunas opcionais
-                self.logger.debug(f"Coluna opcional '{standard_col}' não encontrada")
-            elif not found:
-                self.logger.warning(f"Coluna obrigatória '{standard_col}' não encontrada. Procurado por: {possible_names}")
-                return None
-        
-        return mapped_df
-
-    def _clean_excel_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Processa os dados do SEU formato específico"""
-        # [CITE: 3] Esta função parece ser para o formato de "contagem" do Excel.
-        # A lógica dela será integrada e adaptada diretamente no process_excel.
-        try:
-            # Converte GTIN (que veio de CÓD. BARRAS)
-            if 'GTIN' in df.columns:
-                df['GTIN'] = (
-                    df['GTIN']
-                    .astype(str)
-                    .str.replace(r'\D', '', regex=True)  # Remove não-dígitos
-                    .apply(self._remove_leading_zeros)
-                )
-            
-            # Converte estoque para numérico
-            if 'Estoque' in df.columns:
-                df['Estoque'] = pd.to_numeric(df['Estoque'], errors='coerce').fillna(0)
-            
-            # Processa texto das colunas opcionais
-            for col in ['Operador', 'Endereco']:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.strip()
-            
-            # Agrupa por GTIN (CÓD. BARRAS)
-            if 'GTIN' in df.columns:
-                agg_rules = {'Estoque': 'sum'}
-                for col in ['Operador', 'Endereco']:
-                    if col in df.columns:
-                        agg_rules[col] = lambda x: ' / '.join(sorted(set(x.astype(str))))
-                
-                return df.groupby('GTIN', as_index=False).agg(agg_rules)
-            
-            return df
-        except Exception as e:
-            self.logger.error(f"Erro na limpeza dos dados: {str(e)}", exc_info=True)
-            raise
-
     def process_excel(self, file_path: str) -> Tuple[bool, str]:
         """
         [CITE: 3] FUNÇÃO PRINCIPAL PARA EXCEL - Esta será a que passará pelas maiores mudanças.
         Processa arquivo Excel de contagem, salva o XLSX original
         e converte os dados para Parquet, armazenando-os como 'manual_counts.parquet'.
         """
+        return self.process_excel_files([file_path])
+
+    def process_excel_files(self, file_paths: List[str]) -> Tuple[bool, str]:
+        """
+        Processa um ou mais arquivos Excel de contagem de uma vez. A leitura das planilhas
+        (a etapa mais pesada, feita em Python puro pelo openpyxl) roda em processos separados
+        quando há mais de um arquivo; a consolidação e a gravação de 'manual_counts.parquet'
+        acontecem uma única vez no final. Se algum arquivo for inválido, nada é gravado.
+        """
         try:
             # [CITE: 3] Obtenha o caminho da pasta de dados do inventário ativo
             data_path = Path(self.inventory_manager.get_active_inventory_data_path())
             if not data_path:
                 return False, "Nenhum inventário ativo selecionado"
+            if not file_paths:
+                return False, "Nenhum arquivo selecionado"
 
             # [CITE: 3] Garante que a pasta de dados principal e a de 'manual_imports' existem
             data_path.mkdir(exist_ok=True)
@@ -320,92 +292,31 @@ class FileProcessor:
             manual_imports_dir.mkdir(parents=True, exist_ok=True)
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            original_file_name = Path(file_path).name
-            
-            # [CITE: 3] Salva o arquivo XLSX original na pasta de imports manuais
-            saved_xlsx_path = manual_imports_dir / f"import_{timestamp}_{original_file_name}"
-            shutil.copy2(file_path, saved_xlsx_path) # Copia o arquivo, mantendo metadados
-            self.logger.info(f"Arquivo XLSX original salvo em: {saved_xlsx_path}")
-
-            self.logger.info(f"Processando Excel: {file_path}")
-            df = pd.read_excel(file_path, sheet_name=0)
-            df.dropna(how='all', inplace=True) # Remove linhas completamente vazias
-
-            if len(df) < 1:
-                return False, "Planilha vazia ou sem dados válidos"
-
-            # [CITE: 3] NOVO: Mapeamento de colunas do Excel para nomes padronizados (mais robusto)
-            # Este mapeamento é para pegar os nomes do seu Excel e transformá-los nos nomes que o sistema espera
-            # ATENÇÃO: Verifique ESTES nomes (à esquerda) com os cabeçalhos REAIS do seu Excel
-            column_rename_map = {
-                'cód. barras': 'COD_BARRAS',
-                'cod. barras': 'COD_BARRAS',
-                'codigo barras': 'COD_BARRAS',
-                'codigo_barras': 'COD_BARRAS', # Adicionado por segurança
-                'código de barras': 'COD_BARRAS', # Adicionado por segurança
-                
-                'qnt. contada': 'QNT_CONTADA',
-                'quantidade contada': 'QNT_CONTADA',
-                'qnt contada': 'QNT_CONTADA', # Adicionado por segurança
-                'quantidade_contada': 'QNT_CONTADA', # Adicionado por segurança
+            for file_path in file_paths:
+                original_file_name = Path(file_path).name
                 
-                'operador': 'OPERADOR',
-                'endereço': 'ENDERECO', # Pode ser 'endereço' ou 'endereco'
-                'endereco': 'ENDERECO',
-                'loja key': 'LOJA_KEY', # Adicionado: Se LOJA KEY vem no Excel
-                'loja_key': 'LOJA_KEY', # Adicionado: Se LOJA KEY vem no Excel
-            }
-            
-            # Normaliza os nomes das colunas existentes no DataFrame
-            df.columns = [column_rename_map.get(col.lower().strip(), col) for col in df.columns]
-            
-            # [CITE: 3] Verifica colunas obrigatórias após o renomeamento
-            required_columns = {'COD_BARRAS', 'QNT_CONTADA'}
-            missing = required_columns - set(df.columns)
-            if missing:
-                return False, f"Colunas obrigatórias faltando após renomeamento: {', '.join(missing)}. " \
-                              f"Verifique o mapeamento e os cabeçalhos do Excel."
-
-            # [CITE: 3] Processa dados: COD_BARRAS
-            df['COD_BARRAS'] = (
-                df['COD_BARRAS']
-                .astype(str)
-                .str.replace(r'\.0$', '', regex=True) # Remove '.0' de números interpretados como float
-                .str.replace(r'\D', '', regex=True) # Remove não-dígitos
-                .apply(self._remove_leading_zeros)
-            )
-
-            # [CITE: 3] Processa dados: QNT_CONTADA
-            df['QNT_CONTADA'] = pd.to_numeric(df['QNT_CONTADA'], errors='coerce').fillna(0)
-
-            # [CITE: 3] Processa dados: Colunas de texto (OPERADOR, ENDERECO)
-            text_cols = ['OPERADOR', 'ENDERECO']
-            for col in text_cols:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.strip()
-                else: # Adiciona a coluna se não existir, com valor padrão vazio
-                    df[col] = '' 
-            
-            # [CITE: 3] Adiciona LOJA_KEY se ela não veio no Excel (pode ser obtida do inventário ativo)
-            if 'LOJA_KEY' not in df.columns:
-                inv_info = self.inventory_manager.get_active_inventory_info()
-                if inv_info and 'loja' in inv_info:
-                    df['LOJA_KEY'] = int(inv_info['loja']) # Assume que 'loja' do inv_info é a loja_key numérica
-                else:
-                    self.logger.warning("LOJA_KEY não encontrada no Excel e não disponível no inventário ativo. Definindo como 0.")
-                    df['LOJA_KEY'] = 0 # Valor padrão se não for encontrado
-
-            # [CITE: 3] Regras de agregação (para somar quantidades e concatenar operadores/endereços)
-            agg_rules = {'QNT_CONTADA': 'sum'}
-            # Adiciona Operador e Endereco às regras de agregação se existirem no DF
-            for col in text_cols:
-                if col in df.columns:
-                    # Agrega strings únicas, converte para string e join com ' / '
-                    agg_rules[col] = lambda x: ' / '.join(sorted(set(str(val) for val in x if pd.notna(val) and str(val).strip())))
-            
-            # [CITE: 3] Agrupa por COD_BARRAS (e LOJA_KEY se você quiser considerar itens da mesma loja)
-            # Recomendo agrupar por ['COD_BARRAS', 'LOJA_KEY'] se diferentes lojas podem ter o mesmo COD_BARRAS
-            grouped_df = df.groupby(['COD_BARRAS', 'LOJA_KEY'], as_index=False).agg(agg_rules)
+                # [CITE: 3] Salva o arquivo XLSX original na pasta de imports manuais
+                saved_xlsx_path = manual_imports_dir / f"import_{timestamp}_{original_file_name}"
+                shutil.copy2(file_path, saved_xlsx_path) # Copia o arquivo, mantendo metadados
+                self.logger.info(f"Arquivo XLSX original salvo em: {saved_xlsx_path}")
+
+            self.logger.info(f"Processando Excel: {', '.join(file_paths)}")
+            if len(file_paths) > 1:
+                # Cada planilha é independente: lê em paralelo, contornando o GIL
+                workers = min(len(file_paths), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    raw_dfs = list(executor.map(_read_count_excel, file_paths))
+            else:
+                raw_dfs = [_read_count_excel(file_paths[0])]
+
+            grouped_dfs = []
+            for file_path, df in zip(file_paths, raw_dfs):
+                grouped_df, error = self._prepare_excel_counts(df)
+                if grouped_df is None:
+                    if len(file_paths) > 1:
+                        error = f"{Path(file_path).name}: {error}"
+                    return False, error
+                grouped_dfs.append(grouped_df)
 
             # [CITE: 3] NOVO: O arquivo de saída para contagens manuais será 'manual_counts.parquet'
             output_parquet_file = data_path / "manual_counts.parquet"
@@ -413,27 +324,113 @@ class FileProcessor:
             # [CITE: 3] Carrega dados existentes (manual_counts.parquet) se houver
             if output_parquet_file.exists():
                 existing_df = pd.read_parquet(output_parquet_file)
-                
+                # Arquivos antigos gravavam o código sem zeros à esquerda
+                existing_df['COD_BARRAS'] = DataCombiner.standardize_barcode(existing_df['COD_BARRAS'])
+                grouped_dfs.insert(0, existing_df)
+
+            if len(grouped_dfs) > 1:
                 # [CITE: 3] Concatena os dados existentes com os novos
-                final_df = pd.concat([existing_df, grouped_df], ignore_index=True)
+                final_df = pd.concat(grouped_dfs, ignore_index=True)
                 
                 # [CITE: 3] Reaplica a agregação para garantir que novas contagens do mesmo item/loja somem
                 # e operadores/endereços sejam atualizados
-                final_df = final_df.groupby(['COD_BARRAS', 'LOJA_KEY'], as_index=False).agg(agg_rules)
-                
+                final_df = final_df.groupby(['COD_BARRAS', 'LOJA_KEY'], as_index=False).agg(self._excel_agg_rules())
             else:
-                final_df = grouped_df
+                final_df = grouped_dfs[0]
 
             # [CITE: 3] Salva o arquivo atualizado (manual_counts.parquet)
             final_df.to_parquet(output_parquet_file, index=False)
-            
-            # [CITE: 3] REMOVA ESTE BLOCO - A combinação será disparada pelo DataCombiner
-            # combiner = DataCombiner(data_path)
-            # combiner.combine_data()
 
             return True, (f"Dados processados com sucesso. "
                           f"Total de {len(final_df)} itens únicos contados. "
                           f"Quantidade total: {final_df['QNT_CONTADA'].sum():.0f}")
         except Exception as e:
             self.logger.error(f"Erro ao processar Excel: {e}", exc_info=True)
-            return False, f"Erro ao processar Excel: {str(e)}"
\ No newline at end of file
+            return False, f"Erro ao processar Excel: {str(e)}"
+
+    @staticmethod
+    def _excel_agg_rules() -> dict:
+        """[CITE: 3] Regras de agregação (para somar quantidades e concatenar operadores/endereços)"""
+        agg_rules = {'QNT_CONTADA': 'sum'}
+        for col in ['OPERADOR', 'ENDERECO']:
+            # Agrega strings únicas, converte para string e join com ' / '
+            agg_rules[col] = lambda x: ' / '.join(sorted(set(str(val) for val in x if pd.notna(val) and str(val).strip())))
+        return agg_rules
+
+    def _prepare_excel_counts(self, df: pd.DataFrame) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        Padroniza as colunas de uma planilha de contagem já lida e agrega por item/loja.
+        Retorna (DataFrame agregado, '') ou (None, mensagem de erro).
+        """
+        if len(df) < 1:
+            return None, "Planilha vazia ou sem dados válidos"
+
+        # [CITE: 3] NOVO: Mapeamento de colunas do Excel para nomes padronizados (mais robusto)
+        # Este mapeamento é para pegar os nomes do seu Excel e transformá-los nos nomes que o sistema espera
+        # ATENÇÃO: Verifique ESTES nomes (à esquerda) com os cabeçalhos REAIS do seu Excel
+        column_rename_map = {
+            'cód. barras': 'COD_BARRAS',
+            'cod. barras': 'COD_BARRAS',
+            'codigo barras': 'COD_BARRAS',
+            'codigo_barras': 'COD_BARRAS', # Adicionado por segurança
+            'código de barras': 'COD_BARRAS', # Adicionado por segurança
+            
+            'qnt. contada': 'QNT_CONTADA',
+            'quantidade contada': 'QNT_CONTADA',
+            'qnt contada': 'QNT_CONTADA', # Adicionado por segurança
+            'quantidade_contada': 'QNT_CONTADA', # Adicionado por segurança
+            
+            'operador': 'OPERADOR',
+            'endereço': 'ENDERECO', # Pode ser 'endereço' ou 'endereco'
+            'endereco': 'ENDERECO',
+            'loja key': 'LOJA_KEY', # Adicionado: Se LOJA KEY vem no Excel
+            'loja_key': 'LOJA_KEY', # Adicionado: Se LOJA KEY vem no Excel
+        }
+        
+        # Normaliza os nomes das colunas existentes no DataFrame
+        df.columns = [column_rename_map.get(col.lower().strip(), col) for col in df.columns]
+        
+        # [CITE: 3] Verifica colunas obrigatórias após o renomeamento
+        required_columns = {'COD_BARRAS', 'QNT_CONTADA'}
+        missing = required_columns - set(df.columns)
+        if missing:
+            return None, f"Colunas obrigatórias faltando após renomeamento: {', '.join(missing)}. " \
+                         f"Verifique o mapeamento e os cabeçalhos do Excel."
+
+        # [CITE: 3] Processa dados: COD_BARRAS
+        # Grava já no formato GTIN-13 usado como chave pelo DataCombiner
+        # (inclui a remoção do '.0' de números interpretados como float)
+        df['COD_BARRAS'] = DataCombiner.standardize_barcode(df['COD_BARRAS'])
+
+        # [CITE: 3] Processa dados: QNT_CONTADA
+        df['QNT_CONTADA'] = pd.to_numeric(df['QNT_CONTADA'], errors='coerce').fillna(0)
+
+        # [CITE: 3] Processa dados: Colunas de texto (OPERADOR, ENDERECO)
+        for col in ['OPERADOR', 'ENDERECO']:
+            if col in df.columns:
+                df[col] = df[col].astype(str).str.strip()
+            else: # Adiciona a coluna se não existir, com valor padrão vazio
+                df[col] = '' 
+        
+        # [CITE: 3] Adiciona LOJA_KEY se ela não veio no Excel (pode ser obtida do inventário ativo)
+        if 'LOJA_KEY' not in df.columns:
+            inv_info = self.inventory_manager.get_active_inventory_info()
+            if inv_info and 'loja' in inv_info:
+                df['LOJA_KEY'] = int(inv_info['loja']) # Assume que 'loja' do inv_info é a loja_key numérica
+            else:
+                self.logger.warning("LOJA_KEY não encontrada no Excel e não disponível no inventário ativo. Definindo como 0.")
+                df['LOJA_KEY'] = 0 # Valor padrão se não for encontrado
+
+        # [CITE: 3] Agrupa por COD_BARRAS (e LOJA_KEY se você quiser considerar itens da mesma loja)
+        # Recomendo agrupar por ['COD_BARRAS', 'LOJA_KEY'] se diferentes lojas podem ter o mesmo COD_BARRAS
+        return df.groupby(['COD_BARRAS', 'LOJA_KEY'], as_index=False).agg(self._excel_agg_rules()), ''
+
+
+def _read_count_excel(file_path: str) -> pd.DataFrame:
+    """
+    Lê a primeira planilha de um Excel de contagem e remove linhas totalmente vazias.
+    Função de módulo (e não método) para poder ser enviada a um ProcessPoolExecutor.
+    """
+    df = pd.read_excel(file_path, sheet_name=0)
+    df.dropna(how='all', inplace=True) # Remove linhas completamente vazias
+    return df
@@ -20,6 +20,9 @@ class InventoryManager:
         self.data_folder = data_folder
         self.logger = logging.getLogger(__name__)
         
+        # Cache da lista de inventários: (st_mtime_ns da pasta principal, lista)
+        self._inventory_list_cache: Optional[tuple] = None
+        
         # Cria pasta principal se não existir
         os.makedirs(self.data_folder, exist_ok=True)
     
@@ -59,6 +62,7 @@ class InventoryManager:
             
             # Salva metadados
             pd.DataFrame([metadata]).to_parquet(os.path.join(inventory_path, "metadata.parquet"))
+            self._inventory_list_cache = None
             
             # Define como ativo automaticamente
             self.active_inventory = inventory_name
@@ -101,6 +105,7 @@ class InventoryManager:
             metadata["ultima_modificacao"] = datetime.now().isoformat()
             metadata["status"] = "ativo"
             pd.DataFrame([metadata]).to_parquet(metadata_path)
+            self._inventory_list_cache = None
             
             # Define como ativo
             self.active_inventory = metadata.get("nome", "Inventário Desconhecido")
@@ -116,10 +121,20 @@ class InventoryManager:
     def get_inventory_list(self) -> List[Dict[str, Any]]:
         """
         Retorna lista detalhada de todos os inventários disponíveis.
+        O resultado fica em cache enquanto a data de modificação da pasta principal
+        não mudar (criar ou remover uma pasta de inventário a altera).
         
         Returns:
             List[Dict[str, Any]]: Lista de dicionários com informações de cada inventário
         """
+        try:
+            folder_mtime = os.stat(self.data_folder).st_mtime_ns
+        except OSError:
+            folder_mtime = None
+        if (folder_mtime is not None and self._inventory_list_cache is not None
+                and self._inventory_list_cache[0] == folder_mtime):
+            return list(self._inventory_list_cache[1])
+        
         inventories = []
         try:
             for item in os.listdir(self.data_folder):
@@ -141,7 +156,10 @@ class InventoryManager:
         except Exception as e:
             self.logger.error(f"Erro ao listar inventários: {e}", exc_info=True)
             
-        return sorted(inventories, key=lambda x: x.get("created_at", ""), reverse=True)
+        inventories = sorted(inventories, key=lambda x: x.get("created_at", ""), reverse=True)
+        if folder_mtime is not None:
+            self._inventory_list_cache = (folder_mtime, inventories)
+        return list(inventories)
     
     def get_active_inventory_data_path(self) -> Optional[str]:
         """
@@ -223,6 +241,7 @@ class InventoryManager:
                 self.active_inventory_path = None
                 
             shutil.rmtree(inventory_path)
+            self._inventory_list_cache = None
             self.logger.info(f"Inventário removido: {inventory_path}")
             return True
             
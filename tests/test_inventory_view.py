@@ -0,0 +1,180 @@
+import logging
+import threading
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+inventory_view = pytest.importorskip("ui.inventory_view")
+
+from ui.inventory_view import DisplayColumn, InventoryView
+
+
+def _bare_view():
+    """InventoryView sem widgets Tk: só o estado usado pelo processamento dos dados."""
+    view = InventoryView.__new__(InventoryView)
+    view.logger = logging.getLogger("test_inventory_view")
+    view.columns = [
+        DisplayColumn('GTIN', 'str', 150),
+        DisplayColumn('Estoque', 'int', 80),
+        DisplayColumn('QNT_CONTADA', 'int', 100),
+        DisplayColumn('DIFERENCA', 'int', 100),
+        DisplayColumn('Flag', 'str', 80),
+    ]
+    view._stop_loading = threading.Event()
+    view._load_generation = 0
+    return view
+
+
+@pytest.mark.parametrize("dtype", ["object", "str", "string[pyarrow]"])
+def test_normalize_data_flag_as_category(dtype):
+    try:
+        flags = pd.Series(["OK", "ALERTA", "OK"], dtype=dtype)
+    except TypeError:
+        pytest.skip(f"dtype {dtype} indisponível nesta versão do pandas")
+    data = pd.DataFrame({
+        'GTIN': ["1", "2", "3"],
+        'Estoque': [5, 3, 1],
+        'QNT_CONTADA': [5, 4, 0],
+        'Flag': flags,
+    })
+    
+    processed = _bare_view()._normalize_data(data)
+    
+    assert isinstance(processed['Flag'].dtype, pd.CategoricalDtype)
+    assert list(processed['Flag']) == ["OK", "ALERTA", "OK"]
+    assert list(processed['DIFERENCA']) == [0, 1, -1]
+
+
+def test_normalize_data_keeps_categorical_flag():
+    flags = pd.Series(["OK", "ALERTA"], dtype="category")
+    data = pd.DataFrame({'GTIN': ["1", "2"], 'Flag': flags})
+    
+    processed = _bare_view()._normalize_data(data)
+    
+    assert processed['Flag'].dtype is flags.dtype
+
+
+class _FakeTree:
+    """Substitui o Treeview: guarda (values, tags) por item, na ordem de exibição."""
+    
+    def __init__(self):
+        self.items = {}
+        self.order = []
+        self._selection = ()
+        self._next_id = 0
+    
+    def insert(self, rows, index):
+        ids = []
+        for values, tags in rows:
+            self._next_id += 1
+            iid = f"I{self._next_id:03d}"
+            self.items[iid] = (tuple(values), tuple(tags))
+            self.order.insert(index, iid)
+            ids.append(iid)
+        return ids
+    
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+    
+    def selection(self):
+        return self._selection
+    
+    def selection_set(self, items):
+        self._selection = tuple(items)
+    
+    def yview_moveto(self, fraction):
+        pass
+
+
+def _paged_view(monkeypatch, row_count, page_size):
+    """View com Treeview e agendamento falsos; as etapas ociosas só rodam quando o teste pede."""
+    tree = _FakeTree()
+    monkeypatch.setattr(inventory_view, "insert_rows",
+                        lambda t, rows, parent="", index="end": t.insert(rows, index))
+    monkeypatch.setattr(inventory_view, "update_rows",
+                        lambda t, ids, rows: t.items.update(
+                            (iid, (tuple(v), tuple(g))) for iid, (v, g) in zip(ids, rows)))
+    
+    view = _bare_view()
+    view.tree = tree
+    view.idle_jobs = {}
+    job_ids = iter(range(1_000_000))
+    
+    def after_idle(func, *args):
+        job = f"idle#{next(job_ids)}"
+        view.idle_jobs[job] = (func, args)
+        return job
+    
+    view.after_idle = after_idle
+    view.after_cancel = lambda job: view.idle_jobs.pop(job, None)
+    view._update_page_info = lambda: None
+    
+    view.current_data = pd.DataFrame({
+        'GTIN': [f"G{i}" for i in range(row_count)],
+        'Estoque': list(range(row_count)),
+        'QNT_CONTADA': list(range(row_count)),
+        'DIFERENCA': [0] * row_count,
+        'Flag': ["OK"] * row_count,
+    })
+    view._display_order = None
+    view._display_positions = view.current_data.columns.get_indexer_for(
+        [col.name for col in view.columns])
+    view._row_count = row_count
+    view.page_size = page_size
+    view.total_pages = -(-row_count // page_size)
+    view.current_page = 0
+    view._page_cache = {}
+    view._row_iids = []
+    view._render_job = None
+    view._render_next = None
+    return view
+
+
+def _run_idle(view):
+    while view.idle_jobs:
+        func, args = view.idle_jobs.pop(next(iter(view.idle_jobs)))
+        func(*args)
+
+
+def test_get_selected_rows_maps_items_to_page_cache(monkeypatch):
+    view = _paged_view(monkeypatch, row_count=500, page_size=250)
+    view._show_current_page()
+    _run_idle(view)
+    
+    tree = view.tree
+    assert tree.order == view._row_iids
+    tree.selection_set([view._row_iids[3], view._row_iids[240]])
+    
+    selected = view.get_selected_rows()
+    
+    assert [row['id'] for row in selected] == [view._row_iids[3], view._row_iids[240]]
+    assert selected[0]['values']['GTIN'] == "G3"
+    assert selected[0]['values']['Estoque'] == 3
+    assert selected[1]['values']['GTIN'] == "G240"
+    assert selected[0]['tags'] == []
+
+
+def test_get_selected_rows_on_partly_rendered_page(monkeypatch):
+    view = _paged_view(monkeypatch, row_count=500, page_size=250)
+    view._show_current_page()
+    _run_idle(view)
+    
+    # Próxima página: os itens são reaproveitados e só a primeira etapa é atualizada na hora
+    view.current_page = 1
+    view._show_current_page()
+    tree = view.tree
+    stale_item = view._row_iids[240]
+    assert view._render_job is not None
+    assert tree.items[stale_item][0][0] == "G240"
+    
+    tree.selection_set([view._row_iids[10], stale_item])
+    selected = view.get_selected_rows()
+    
+    assert [row['values']['GTIN'] for row in selected] == ["G260", "G490"]
+    # As etapas pendentes foram concluídas: o item exibe a mesma linha devolvida
+    assert view._render_job is None and not view.idle_jobs
+    assert tree.items[stale_item][0][0] == "G490"
+    assert tree.order == view._row_iids
@@ -1,8 +1,8 @@
 #import_dialog.py
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog
-from pathlib import Path
-from typing import Optional
+from typing import List
 
 class ImportDialog(tk.Toplevel):
     def __init__(self, parent):
@@ -11,7 +11,7 @@ class ImportDialog(tk.Toplevel):
         self.geometry("500x300")
         self.resizable(False, False)
         
-        self.file_path: Optional[str] = None
+        self.file_paths: List[str] = []
         
         self.create_widgets()
         self.center_on_parent()
@@ -25,7 +25,7 @@ class ImportDialog(tk.Toplevel):
         # Título
         ttk.Label(
             main_frame, 
-            text="Selecione o arquivo Excel com os dados de contagem",
+            text="Selecione os arquivos Excel com os dados de contagem",
             font=('Helvetica', 10, 'bold')
         ).pack(pady=(0, 20))
         
@@ -53,7 +53,7 @@ class ImportDialog(tk.Toplevel):
         
         ttk.Button(
             file_frame,
-            text="Selecionar Arquivo Excel",
+            text="Selecionar Arquivos Excel",
             command=self.select_file
         ).pack(side=tk.LEFT)
         
@@ -83,21 +83,21 @@ class ImportDialog(tk.Toplevel):
         self.import_btn.pack(side=tk.RIGHT)
         
     def select_file(self):
-        """Abre diálogo para selecionar arquivo"""
+        """Abre diálogo para selecionar um ou mais arquivos"""
         file_types = [
             ("Arquivos Excel", "*.xlsx *.xls"),
             ("Todos os arquivos", "*.*")
         ]
         
-        file_path = filedialog.askopenfilename(
-            title="Selecione o arquivo de contagem",
+        file_paths = filedialog.askopenfilenames(
+            title="Selecione os arquivos de contagem",
             filetypes=file_types
         )
         
-        if file_path:
-            self.file_path = file_path
+        if file_paths:
+            self.file_paths = list(file_paths)
             self.file_label.config(
-                text=Path(file_path).name,
+                text=os.path.basename(file_paths[0]) if len(file_paths) == 1 else f"{len(file_paths)} arquivos selecionados",
                 foreground="black"
             )
             self.import_btn.config(state=tk.NORMAL)
@@ -126,7 +126,7 @@ class ImportDialog(tk.Toplevel):
     
     def cancel(self):
         """Fecha o diálogo sem confirmar"""
-        self.file_path = None
+        self.file_paths = []
         self.destroy()
     
     def confirm(self):
@@ -137,4 +137,4 @@ class ImportDialog(tk.Toplevel):
         """Exibe o diálogo e espera pela resposta"""
         self.grab_set()
         self.wait_window(self)
-        return self.file_path
\ No newline at end of file
+        return self.file_paths
\ No newline at end of file
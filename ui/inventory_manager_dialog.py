@@ -1,10 +1,12 @@
 #inventory_manager_dialog.py
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Dict, Any
-from pathlib import Path
+from ui.treeview_batch import insert_rows
 
 class InventoryManagerDialog(tk.Toplevel):
+    # Quantidade de linhas inseridas por lote (o primeiro lote já preenche a área visível)
+    LOAD_BATCH_SIZE = 200
+
     def __init__(self, parent, inventory_manager):
         super().__init__(parent)
         self.title("Gerenciar Inventários")
@@ -12,6 +14,8 @@ class InventoryManagerDialog(tk.Toplevel):
         
         self.inventory_manager = inventory_manager
         self.result = None
+        self._inventories = []
+        self._load_job = None  # Lote pendente de inserção na lista
         
         self.create_widgets()
         self.center_on_parent()
@@ -107,18 +111,33 @@ class InventoryManagerDialog(tk.Toplevel):
         self.geometry(f"+{x}+{y}")
     
     def load_inventories(self):
-        """Carrega a lista de inventários existentes"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """
+        Carrega a lista de inventários existentes. Apenas o primeiro lote é inserido
+        de imediato; o restante é inserido em lotes quando a interface fica ociosa,
+        para que o diálogo abra sem esperar a lista inteira.
+        """
+        self._cancel_pending_load()
+        self.tree.delete(*self.tree.get_children())
             
-        inventories = self.inventory_manager.get_inventory_list()
-        for inv in inventories:
-            self.tree.insert("", "end", values=(
-                inv["name"],
-                inv["store"],
-                inv["created_at"],
-                inv["path"]
-            ))
+        self._inventories = self.inventory_manager.get_inventory_list()
+        self._insert_batch(0)
+
+    def _insert_batch(self, start: int):
+        """Insere um lote de inventários e agenda o próximo"""
+        self._load_job = None
+        end = start + self.LOAD_BATCH_SIZE
+        insert_rows(self.tree, (
+            ((inv["name"], inv["store"], inv["created_at"], inv["path"]), ())
+            for inv in self._inventories[start:end]
+        ))
+        if end < len(self._inventories):
+            self._load_job = self.after_idle(self._insert_batch, end)
+
+    def _cancel_pending_load(self):
+        """Cancela a inserção de lotes ainda pendentes"""
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
     
     def create_inventory(self):
         """Cria um novo inventário"""
@@ -154,6 +173,11 @@ class InventoryManagerDialog(tk.Toplevel):
         else:
             tk.messagebox.showerror("Erro", "Não foi possível selecionar o inventário")
     
+    def destroy(self):
+        """Cancela lotes pendentes antes de destruir a janela"""
+        self._cancel_pending_load()
+        super().destroy()
+    
     def cancel(self):
         """Fecha o diálogo sem selecionar"""
         self.result = None
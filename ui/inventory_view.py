@@ -2,14 +2,17 @@
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
-from typing import Optional, Dict, List, Any, Tuple, Callable
+import numpy as np
+import pyarrow.parquet as pq
+from typing import Optional, Dict, List, Any, Tuple
 import logging
-from datetime import datetime
+import time
 import threading
-from queue import Queue
+from concurrent.futures import CancelledError
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum, auto
+from ui.treeview_batch import insert_rows, update_rows
 
 # Tipos de dados para melhor organização
 class SortDirection(Enum):
@@ -24,6 +27,52 @@ class DisplayColumn:
     anchor: str = 'center'
     stretch: bool = True
 
+# Tuplas de tags compartilhadas, indexadas por (estado da diferença * 2 + alerta)
+_ROW_TAG_TABLE = np.empty(6, dtype=object)
+for _code, _tags in enumerate([(), ('alerta',), ('excesso',), ('excesso', 'alerta'),
+                               ('faltante',), ('faltante', 'alerta')]):
+    _ROW_TAG_TABLE[_code] = _tags
+
+class _LazySortOrder:
+    """Ordem de exibição resolvida sob demanda: só as posições das páginas já pedidas são ordenadas.
+    
+    Cada resolução separa as próximas linhas com np.argpartition (O(N)) e ordena apenas esse trecho,
+    em vez de ordenar o DataFrame inteiro antes de exibir a primeira página.
+    """
+    
+    def __init__(self, keys: np.ndarray, ascending: bool):
+        self._keys = keys
+        self._ascending = ascending
+        self._resolved = np.empty(0, dtype=np.intp)
+        self._remaining = np.arange(len(keys))
+    
+    def positions(self, start: int, end: int) -> np.ndarray:
+        """Retorna as posições (no DataFrame original) das linhas [start:end] da ordem final."""
+        missing = end - len(self._resolved)
+        if missing > 0:
+            self._resolve(missing)
+        return self._resolved[start:end]
+    
+    def _resolve(self, count: int):
+        """Separa as próximas `count` linhas ainda não ordenadas e as acrescenta já em ordem."""
+        rest = self._remaining
+        if count >= len(rest):
+            chosen, rest = rest, rest[:0]
+        else:
+            # Os `count` menores (ou maiores) ficam de um lado do pivô, sem ordenar o restante
+            kth = count - 1 if self._ascending else len(rest) - count
+            split = np.argpartition(self._keys[rest], kth)
+            if self._ascending:
+                chosen, rest = rest[split[:count]], rest[split[count:]]
+            else:
+                chosen, rest = rest[split[kth:]], rest[split[:kth]]
+        
+        order = np.argsort(self._keys[chosen], kind='stable')
+        if not self._ascending:
+            order = order[::-1]
+        self._resolved = np.concatenate([self._resolved, chosen[order]])
+        self._remaining = rest
+
 class InventoryView(ttk.Frame):
     """Visualização avançada de dados de inventário com paginação, ordenação e formatação condicional."""
     
@@ -31,6 +80,20 @@ class InventoryView(ttk.Frame):
     DEFAULT_PAGE_SIZE = 1000
     DEFAULT_SORT_COLUMN = 'DIFERENCA'
     DEFAULT_SORT_DIRECTION = SortDirection.DESCENDING
+    PAGE_CACHE_SIZE = 32  # Máximo de páginas formatadas mantidas em memória
+    RENDER_CHUNK_SIZE = 100  # Linhas inseridas por etapa; a primeira já cobre a área visível
+    DISPLAY_DEBOUNCE_MS = 50  # Pedidos de exibição feitos dentro deste intervalo são agrupados
+    SYNC_LOAD_MAX_ROWS = 50_000  # Abaixo disso o processamento roda direto na thread da UI
+    LAZY_SORT_FACTOR = 4  # Acima de LAZY_SORT_FACTOR * page_size linhas, a ordenação é feita por página
+    
+    # Formatadores numéricos por coluna, criados uma única vez (format já vinculado ao molde)
+    NUMERIC_FORMATTERS = {
+        'Preco': "R$ {:,.2f}".format,
+        'Custo': "R$ {:,.2f}".format,
+        'DIFERENCA': "{:+,.0f}".format,
+    }
+    DEFAULT_NUMERIC_FORMATTER = "{:,.0f}".format
+    COUNT_COLUMNS = ('Estoque', 'QNT_CONTADA', 'DIFERENCA')  # Quantidades inteiras: cabem em int32
     
     def __init__(self, master: tk.Misc, **kwargs):
         """Inicializa a visualização de inventário.
@@ -54,7 +117,6 @@ class InventoryView(ttk.Frame):
         """Configura o estado inicial da visualização."""
         # Dados
         self.current_data: Optional[pd.DataFrame] = None
-        self.filtered_data: Optional[pd.DataFrame] = None
         
         # Ordenação
         self._sort_column = self.DEFAULT_SORT_COLUMN
@@ -64,16 +126,32 @@ class InventoryView(ttk.Frame):
         self.page_size = self.DEFAULT_PAGE_SIZE
         self.current_page = 0
         self.total_pages = 0
-        
-        # Threading
+        self._row_count = 0  # len(current_data), guardado a cada carga
+        # Linhas já formatadas por página (válidas enquanto current_data e a ordenação não mudam)
+        self._page_cache: Dict[int, List[Tuple[Tuple[str, ...], Tuple[str, ...]]]] = {}
+        # Ordem das linhas de current_data resolvida por página (None = current_data já está ordenado)
+        self._display_order: Optional[_LazySortOrder] = None
+        # Posições em current_data das colunas exibidas, resolvidas uma vez por carga
+        self._display_positions: np.ndarray = np.empty(0, dtype=np.intp)
+        self._render_job: Optional[str] = None  # Etapa pendente de inserção da página
+        self._render_next: Optional[Tuple[list, int]] = None  # Argumentos da etapa pendente
+        # Itens do Treeview na ordem de exibição; são reaproveitados entre páginas (None = ainda não inserido)
+        self._row_iids: List[Optional[str]] = []
+        
+        # Pedido de exibição aguardando o fim da rajada (cliques seguidos nos cabeçalhos)
+        self._display_job: Optional[str] = None
+        self._queued_display: Optional[Tuple[pd.DataFrame, float, Any]] = None
+        # Token do pedido cujo frame está em current_data (repassado por quem chamou display_data)
+        self.loaded_token: Any = None
+        
+        # Threading: um único worker persistente; pedidos sobrepostos são agrupados e só o último é processado
         self._pending_operations = 0
-        self._data_queue: Queue = Queue()
         self._loading_thread: Optional[threading.Thread] = None
         self._stop_loading = threading.Event()
-        
-        # UI State
-        self._style_tags_configured = False
-        self._last_update_time = datetime.now()
+        self._load_condition = threading.Condition()
+        self._pending_load: Optional[Tuple[pd.DataFrame, float, int, Any]] = None
+        self._inflight_load: Optional[Tuple[pd.DataFrame, int, Any]] = None  # Pedido em processamento no worker
+        self._load_generation = 0
         
     def _setup_ui(self):
         """Configura todos os componentes da interface."""
@@ -131,6 +209,9 @@ class InventoryView(ttk.Frame):
                 stretch=col.stretch
             )
         
+        # As tags independem dos dados: configuradas uma vez, junto com o widget
+        self._configure_style_tags()
+        
         # Scrollbars
         y_scroll = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=y_scroll.set)
@@ -200,101 +281,302 @@ class InventoryView(ttk.Frame):
             width=25
         ).pack(side=tk.LEFT)
     
-    def display_data(self, data: pd.DataFrame):
+    def display_data(self, data: pd.DataFrame, token: Any = None):
         """Exibe os dados na Treeview de forma assíncrona e segura.
         
         Args:
             data: DataFrame com os dados a serem exibidos
+            token: Identifica o pedido; fica em loaded_token quando este frame for exibido
+                (antes de <<InventoryDataLoaded>>). Pedidos descartados não o registram.
         """
         if not isinstance(data, pd.DataFrame) or data.empty:
             self._update_status("Nenhum dado para exibir", rows=0)
             return
-            
-        self._pending_operations += 1
-        start_time = datetime.now()
+        
+        # Só o último pedido da rajada é carregado; o tempo exibido conta desde o primeiro
+        if self._display_job is not None:
+            self.after_cancel(self._display_job)
+            start_time = self._queued_display[1]
+        else:
+            self._pending_operations += 1
+            start_time = time.perf_counter()
+        self._queued_display = (data, start_time, token)
+        self._display_job = self.after(self.DISPLAY_DEBOUNCE_MS, self._dispatch_display)
+    
+    def _dispatch_display(self):
+        """Inicia o carregamento do pedido de exibição mais recente."""
+        data, start_time, token = self._queued_display
+        self._display_job = None
+        self._queued_display = None
         
         try:
-            if not self._style_tags_configured:
-                self._configure_style_tags()
-                self._style_tags_configured = True
-            
-            self._load_data_async(data, start_time)
+            if len(data) < self.SYNC_LOAD_MAX_ROWS:
+                self._load_data_sync(data, start_time, token)
+            else:
+                self._load_data_async(data, start_time, token)
         except Exception as e:
             self.logger.error(f"Erro ao iniciar carregamento: {e}", exc_info=True)
             self._update_status("Erro ao carregar dados", error=True)
             self._pending_operations = max(0, self._pending_operations - 1)
     
-    def _load_data_async(self, data: pd.DataFrame, start_time: datetime):
-        """Carrega os dados em uma thread separada."""
-        self._stop_loading.set()
-        if self._loading_thread and self._loading_thread.is_alive():
-            self._loading_thread.join(timeout=1)
-        
-        self._stop_loading.clear()
-        
-        self._loading_thread = threading.Thread(
-            target=self._load_data_background,
-            args=(data.copy(), start_time),
-            daemon=True
-        )
-        self._loading_thread.start()
+    def _load_data_sync(self, data: pd.DataFrame, start_time: float, token: Any = None):
+        """Processa e exibe tabelas pequenas na hora: o repasse ao worker custaria mais que o trabalho."""
+        with self._load_condition:
+            # Resultados ou pedidos ainda pendentes no worker ficam obsoletos
+            self._load_generation += 1
+            generation = self._load_generation
+            if self._pending_load is not None:
+                self._pending_load = None
+                self._pending_operations = max(0, self._pending_operations - 1)
+        
+        processed_data, order = self._process_data(data, generation)
+        self._update_display(processed_data, start_time, order, token)
+    
+    def _load_data_async(self, data: pd.DataFrame, start_time: float, token: Any = None):
+        """Entrega os dados ao worker de carregamento, substituindo um pedido ainda não iniciado."""
+        with self._load_condition:
+            self._load_generation += 1
+            if self._pending_load is not None:
+                # O pedido anterior nem começou: é descartado sem processamento
+                self._pending_operations = max(0, self._pending_operations - 1)
+            self._pending_load = (data, start_time, self._load_generation, token)
+            self._load_condition.notify()
+        
+        if self._loading_thread is None or not self._loading_thread.is_alive():
+            self._stop_loading.clear()
+            self._loading_thread = threading.Thread(target=self._load_data_worker, daemon=True)
+            self._loading_thread.start()
     
-    def _load_data_background(self, data: pd.DataFrame, start_time: datetime):
+    def _load_data_worker(self):
+        """Laço do worker persistente: processa sempre o pedido mais recente."""
+        while True:
+            with self._load_condition:
+                while self._pending_load is None and not self._stop_loading.is_set():
+                    self._load_condition.wait()
+                if self._stop_loading.is_set():
+                    return
+                data, start_time, generation, token = self._pending_load
+                self._pending_load = None
+                self._inflight_load = (data, generation, token)
+            self._load_data_background(data, start_time, generation, token)
+    
+    def _load_data_background(self, data: pd.DataFrame, start_time: float, generation: int,
+                              token: Any = None):
         """Processa os dados em background e atualiza a UI na thread principal."""
         try:
-            processed_data = self._process_data(data)
-            self._data_queue.put(processed_data)
-            
-            self.after(0, lambda: self._update_display(processed_data, start_time))
+            processed_data, order = self._process_data(data, generation)
+            self.after(0, lambda: self._apply_loaded_data(processed_data, order, start_time, generation, token))
+        except CancelledError:
+            # Pedido superado por um mais novo: só encerra a operação pendente
+            if not self._stop_loading.is_set():
+                self.after(0, self._discard_load)
         except Exception as e:
             self.logger.error(f"Erro no carregamento em background: {e}", exc_info=True)
-            self.after(0, lambda: self._update_status(f"Erro: {str(e)}", error=True))
+            if not self._stop_loading.is_set():
+                message = f"Erro: {str(e)}"
+                self.after(0, lambda: self._fail_load(message, generation))
+    
+    def _apply_loaded_data(self, data: pd.DataFrame, order: Optional[_LazySortOrder],
+                           start_time: float, generation: int, token: Any = None):
+        """Exibe o resultado do worker, ignorando-o se um pedido mais novo já foi feito."""
+        if generation != self._load_generation:
+            self._discard_load()
+            return
+        self._update_display(data, start_time, order, token)
+    
+    def _latest_source(self) -> Tuple[Optional[pd.DataFrame], Any]:
+        """Frame e token do pedido de exibição mais recente: o da rajada, o do worker ou o já exibido."""
+        if self._queued_display is not None:
+            return self._queued_display[0], self._queued_display[2]
+        with self._load_condition:
+            if self._pending_load is not None:
+                return self._pending_load[0], self._pending_load[3]
+            if self._inflight_load is not None and self._inflight_load[1] == self._load_generation:
+                return self._inflight_load[0], self._inflight_load[2]
+        return self.current_data, self.loaded_token
+    
+    def _fail_load(self, message: str, generation: int):
+        """Encerra a operação de um carregamento que falhou no worker."""
+        self._discard_load()
+        if generation != self._load_generation:
+            return
+        with self._load_condition:
+            self._inflight_load = None
+        self._update_status(message, error=True)
+    
+    def _discard_load(self):
+        """Encerra a operação pendente de um carregamento descartado."""
+        self._pending_operations = max(0, self._pending_operations - 1)
+    
+    def _check_cancelled(self, generation: Optional[int]):
+        """Ponto de cancelamento do worker: interrompe se há pedido mais novo ou o widget foi destruído.
+        
+        Raises:
+            CancelledError: Se o carregamento não deve continuar
+        """
+        if self._stop_loading.is_set() or (generation is not None and generation != self._load_generation):
+            raise CancelledError()
     
-    def _process_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Processa os dados para exibição com tratamento robusto."""
+    def _process_data(self, data: pd.DataFrame,
+                      generation: Optional[int] = None) -> Tuple[pd.DataFrame, Optional[_LazySortOrder]]:
+        """Processa os dados para exibição com tratamento robusto.
+        
+        Args:
+            data: DataFrame a processar
+            generation: Pedido de carregamento em curso; entre as etapas, o processamento é
+                interrompido se um pedido mais novo chegar
+        
+        Returns:
+            DataFrame processado e, para tabelas grandes, a ordem resolvida por página
+            (nesse caso o DataFrame não é reordenado)
+        """
         try:
-            # Cópia segura para manipulação
-            processed = data.copy()
-            
-            # Conversão de tipos
-            numeric_cols = ['Preco', 'Custo', 'Estoque', 'QNT_CONTADA']
-            for col in numeric_cols:
-                if col in processed.columns:
-                    processed[col] = pd.to_numeric(processed[col], errors='coerce').fillna(0)
-            
-            # Calcula diferença se necessário
-            if 'DIFERENCA' not in processed.columns and all(c in processed.columns for c in ['Estoque', 'QNT_CONTADA']):
-                processed['DIFERENCA'] = processed['QNT_CONTADA'] - processed['Estoque']
+            if data is self.current_data:
+                # Reordenação do frame já exibido: tipos, categorias e DIFERENCA já foram tratados
+                processed = data
+            else:
+                processed = self._normalize_data(data, generation)
             
             # Ordenação
             if self._sort_column in processed.columns:
-                processed = processed.sort_values(
-                    self._sort_column,
-                    ascending=self._sort_direction == SortDirection.ASCENDING
-                )
+                return self._sort_frame(processed)
             
-            return processed
+            return processed, None
             
+        except CancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Erro no processamento de dados: {e}", exc_info=True)
             raise RuntimeError(f"Falha ao processar dados: {e}") from e
     
-    def _update_display(self, data: pd.DataFrame, start_time: datetime):
+    def _normalize_data(self, data: pd.DataFrame, generation: Optional[int] = None) -> pd.DataFrame:
+        """Converte tipos e calcula DIFERENCA; feito uma vez por carga, não a cada reordenação."""
+        # Cópia rasa: as colunas convertidas/adicionadas são substituídas, nunca escritas no array original.
+        # Só as colunas exibidas são mantidas, para as demais não ficarem presas em current_data
+        names = [col.name for col in self.columns if col.name in data.columns]
+        if len(names) < len(data.columns):
+            processed = pd.DataFrame({name: data[name] for name in names}, copy=False)
+        else:
+            processed = data.copy(deep=False)
+        
+        # Conversão de tipos
+        numeric_cols = ['Preco', 'Custo', 'Estoque', 'QNT_CONTADA']
+        for col in numeric_cols:
+            if col in processed.columns:
+                # Colunas já numéricas e sem nulos (o caso do parquet) passam sem nenhuma cópia
+                series = processed[col]
+                converted = not pd.api.types.is_numeric_dtype(series)
+                if converted:
+                    series = pd.to_numeric(series, errors='coerce')
+                if series.hasnans:
+                    series, converted = series.fillna(0), True
+                if converted:
+                    processed[col] = series
+        
+        # Quantidades em int32: metade dos bytes por linha na ordenação e nas máscaras de tags
+        for col in self.COUNT_COLUMNS:
+            if col in processed.columns:
+                downcast = self._downcast_count(processed[col])
+                if downcast is not None:
+                    processed[col] = downcast
+        
+        # Flag tem poucos valores distintos: como categoria, tags e formatação trabalham sobre os códigos
+        # (object, o str do pandas 3 ou string[pyarrow] lido do parquet)
+        if 'Flag' in processed.columns:
+            flag = processed['Flag']
+            if pd.api.types.is_string_dtype(flag) and not isinstance(flag.dtype, pd.CategoricalDtype):
+                processed['Flag'] = flag.astype('category')
+        self._check_cancelled(generation)
+        
+        # Calcula diferença se necessário
+        if 'DIFERENCA' not in processed.columns and all(c in processed.columns for c in ['Estoque', 'QNT_CONTADA']):
+            processed['DIFERENCA'] = processed['QNT_CONTADA'] - processed['Estoque']
+        self._check_cancelled(generation)
+        
+        return processed
+    
+    @staticmethod
+    def _downcast_count(series: pd.Series) -> Optional[pd.Series]:
+        """Converte uma coluna de quantidades para int32, se todos os valores forem inteiros.
+        
+        O limite de ±2**30 garante que QNT_CONTADA - Estoque também caiba em int32.
+        Preços e custos continuam em float64 para não perder centavos.
+        
+        Returns:
+            A coluna convertida, ou None se ela já for int32 ou não puder ser convertida sem perda
+        """
+        if series.dtype == np.int32 or series.dtype.kind not in 'iuf' or series.empty or series.hasnans:
+            return None
+        values = series.to_numpy()
+        if values.min() < -2**30 or values.max() > 2**30:
+            return None
+        if values.dtype.kind == 'f' and not (values == np.trunc(values)).all():
+            return None
+        return series.astype(np.int32)
+    
+    def _sort_frame(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[_LazySortOrder]]:
+        """Ordena pela coluna atual; colunas numéricas são ordenadas direto no array NumPy.
+        
+        Em tabelas numéricas grandes, só a primeira página é ordenada agora: o DataFrame volta
+        sem reordenar, junto com a ordem que resolve as demais páginas sob demanda.
+        """
+        ascending = self._sort_direction == SortDirection.ASCENDING
+        keys = data[self._sort_column].to_numpy()
+        
+        # Texto, tipos anuláveis e floats com NaN seguem pelo sort_values (NaN sempre por último)
+        if keys.dtype.kind not in 'biuf' or (keys.dtype.kind == 'f' and np.isnan(keys).any()):
+            column = data[self._sort_column]
+            # Verificações de ordem em C: sem nulos, a coluna já ordenada (ou invertida) dispensa o sort
+            if not column.hasnans:
+                if column.is_monotonic_increasing if ascending else column.is_monotonic_decreasing:
+                    return data, None
+                if column.is_monotonic_decreasing if ascending else column.is_monotonic_increasing:
+                    return data.take(np.arange(len(keys) - 1, -1, -1)), None
+            return data.sort_values(self._sort_column, ascending=ascending), None
+        
+        # Dados já chegam ordenados ao reordenar pela mesma coluna: basta manter ou inverter
+        in_order = keys[1:] >= keys[:-1] if ascending else keys[1:] <= keys[:-1]
+        if in_order.all():
+            return data, None
+        reversed_order = keys[1:] <= keys[:-1] if ascending else keys[1:] >= keys[:-1]
+        if reversed_order.all():
+            return data.take(np.arange(len(keys) - 1, -1, -1)), None
+        
+        if len(keys) > self.LAZY_SORT_FACTOR * self.page_size:
+            order = _LazySortOrder(keys, ascending)
+            order.positions(0, self.page_size)
+            return data, order
+        
+        order = np.argsort(keys)
+        return data.take(order if ascending else order[::-1]), None
+    
+    def _update_display(self, data: pd.DataFrame, start_time: float,
+                        order: Optional[_LazySortOrder] = None, token: Any = None):
         """Atualiza a exibição com os dados processados."""
         try:
+            with self._load_condition:
+                self._inflight_load = None
             self.current_data = data
-            self.total_pages = max(1, (len(data) // self.page_size) + (1 if len(data) % self.page_size else 0))
+            self.loaded_token = token
+            self._display_order = order
+            self._display_positions = data.columns.get_indexer_for(
+                [col.name for col in self.columns if col.name in data.columns])
+            self._page_cache.clear()
+            self._row_count = len(data)
+            self.total_pages = max(1, -(-self._row_count // self.page_size))
             self.current_page = 0
             
             self._update_pagination_controls()
             self._show_current_page()
             
-            elapsed = (datetime.now() - start_time).total_seconds()
+            elapsed = time.perf_counter() - start_time
             self._update_status(
                 f"Carregado em {elapsed:.2f}s",
-                rows=len(data),
+                rows=self._row_count,
                 sort_col=self._sort_column
             )
+            # Avisa quem depende de current_data (a carga termina depois do debounce/worker)
+            self.event_generate("<<InventoryDataLoaded>>")
             
         except Exception as e:
             self.logger.error(f"Erro ao atualizar exibição: {e}", exc_info=True)
@@ -307,54 +589,162 @@ class InventoryView(ttk.Frame):
         if self.current_data is None:
             return
             
-        self.tree.delete(*self.tree.get_children())
-        
-        start_idx = self.current_page * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.current_data))
-        page_data = self.current_data.iloc[start_idx:end_idx]
-        
-        # Desativa redesenho durante inserção
-        self.tree.bind('<<TreeviewOpen>>', lambda e: 'break')
-        self.tree.config(displaycolumns=[col.name for col in self.columns])
-        
+        self._cancel_pending_render()
+        
+        rows = self._page_cache.get(self.current_page)
+        if rows is None:
+            start_idx = self.current_page * self.page_size
+            end_idx = min(start_idx + self.page_size, self._row_count)
+            # Só as colunas exibidas entram na página, por posição, sem resolver rótulos a cada página
+            if self._display_order is None:
+                page = self.current_data.iloc[start_idx:end_idx, self._display_positions]
+            else:
+                page = self.current_data.iloc[self._display_order.positions(start_idx, end_idx),
+                                              self._display_positions]
+            rows = self._format_rows(page)
+            if len(self._page_cache) >= self.PAGE_CACHE_SIZE:
+                # Descarta a página formatada há mais tempo
+                self._page_cache.pop(next(iter(self._page_cache)))
+            self._page_cache[self.current_page] = rows
+        
+        self._prepare_row_pool(len(rows))
+        
+        # O Treeview só redesenha quando a UI fica ociosa: a remoção e a primeira etapa de
+        # inserção resultam em um único redesenho, sem precisar ocultar o widget
         try:
-            # Insere em blocos para melhor performance
-            for _, row in page_data.iterrows():
-                values, tags = self._prepare_row_data(row)
-                self.tree.insert("", "end", values=values, tags=tags)
+            self._insert_rows_chunk(rows, 0)
         finally:
-            self.tree.unbind('<<TreeviewOpen>>')
             self._update_page_info()
     
-    def _prepare_row_data(self, row: pd.Series) -> Tuple[List[str], List[str]]:
-        """Prepara os dados de uma linha para exibição."""
-        values = []
-        tags = []
+    def _prepare_row_pool(self, row_count: int):
+        """Ajusta os itens existentes do Treeview para receber `row_count` linhas.
         
-        for col in self.columns:
-            val = row.get(col.name, "")
-            
-            # Formatação especial
-            if pd.api.types.is_numeric_dtype(type(val)) and not pd.isna(val):
-                if col.name in ['Preco', 'Custo']:
-                    values.append(f"R$ {val:,.2f}")
-                elif col.name == 'DIFERENCA':
-                    values.append(f"{val:+,.0f}")
-                else:
-                    values.append(f"{val:,.0f}")
-            else:
-                values.append(str(val) if not pd.isna(val) else "")
-            
-            # Tags de formatação condicional
-            if col.name == 'Flag' and str(val).upper() == 'ALERTA!':
-                tags.append('alerta')
-            elif col.name == 'DIFERENCA' and pd.notna(val):
-                if val > 0:
-                    tags.append('excesso')
-                elif val < 0:
-                    tags.append('faltante')
+        Os itens da página anterior são reaproveitados (só valores e tags mudam); sobras são removidas
+        e, se faltarem itens, os novos entram vazios no início, onde a inserção não percorre a lista.
+        Sem itens anteriores, a página é inserida normalmente pelas etapas de renderização.
+        """
+        pool = [iid for iid in self._row_iids if iid is not None]
+        if not pool:
+            self._row_iids = [None] * row_count
+            return
         
-        return values, tags
+        if len(pool) > row_count:
+            self.tree.delete(*pool[row_count:])
+            pool = pool[:row_count]
+        elif len(pool) < row_count:
+            blank = ((), ())
+            # Cada item entra no índice 0: a ordem de exibição é a inversa da ordem de inserção
+            pool = insert_rows(self.tree, [blank] * (row_count - len(pool)), index=0)[::-1] + pool
+        
+        self._row_iids = pool
+        # Itens reaproveitados não devem herdar a seleção nem a rolagem da página anterior
+        self.tree.selection_set(())
+        self.tree.yview_moveto(0)
+    
+    def _insert_rows_chunk(self, rows: List[Tuple[Tuple[str, ...], Tuple[str, ...]]], end: int):
+        """Insere uma etapa de linhas da página e agenda a próxima para quando a UI estiver ociosa.
+        
+        Apenas a primeira etapa (área visível) é inserida antes de a página aparecer; o restante
+        entra em segundo plano sem travar a rolagem nem os cliques.
+        
+        O Treeview percorre a lista de irmãos a cada inserção em "end" (e até a posição, para
+        índices numéricos). Por isso as linhas entram em ordem reversa em posição fixa: a primeira
+        etapa no índice 0 e as demais, do fim da página para o início, logo após a primeira etapa.
+        Quando há itens reaproveitados da página anterior, a etapa apenas atualiza seus valores.
+        
+        Args:
+            rows: Linhas formatadas da página
+            end: Fim (exclusivo) da próxima etapa; 0 indica a etapa inicial
+        """
+        self._render_job = None
+        head_size = min(self.RENDER_CHUNK_SIZE, len(rows))
+        if end == 0:
+            start, end, index = 0, head_size, 0
+        else:
+            start, index = max(head_size, end - self.RENDER_CHUNK_SIZE), head_size
+        
+        # Uma única chamada Tcl por etapa, em vez de um tree.insert por linha
+        if start < end and self._row_iids[start] is not None:
+            update_rows(self.tree, self._row_iids[start:end], rows[start:end])
+        else:
+            ids = insert_rows(self.tree, rows[start:end][::-1], index=index)
+            self._row_iids[start:end] = ids[::-1]
+        
+        next_end = len(rows) if start == 0 else start
+        if next_end > head_size:
+            self._render_next = (rows, next_end)
+            self._render_job = self.after_idle(self._insert_rows_chunk, rows, next_end)
+    
+    def _cancel_pending_render(self):
+        """Cancela as etapas de inserção ainda pendentes da página anterior."""
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+    
+    def _finish_pending_render(self):
+        """Conclui na hora as etapas de inserção ainda pendentes da página atual."""
+        while self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._insert_rows_chunk(*self._render_next)
+    
+    def _format_rows(self, data: pd.DataFrame) -> List[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        """Formata as linhas para exibição coluna a coluna (vetorizado), sem iterar linha a linha.
+        
+        Returns:
+            Lista de (valores formatados, tags) na ordem das linhas de `data`
+        """
+        formatted = [self._format_column(data, col.name) for col in self.columns]
+        return list(zip(zip(*formatted), self._row_tags(data)))
+    
+    def _format_column(self, data: pd.DataFrame, name: str) -> List[str]:
+        """Formata uma coluna inteira como texto de exibição; valores nulos viram ''."""
+        if name not in data.columns:
+            return [""] * len(data)
+        
+        series = data[name]
+        if pd.api.types.is_numeric_dtype(series):
+            fmt = self.NUMERIC_FORMATTERS.get(name, self.DEFAULT_NUMERIC_FORMATTER)
+            # Nulos (inclusive pd.NA de tipos anuláveis) viram NaN e recebem o código -1 do factorize
+            codes, uniques = pd.factorize(series.to_numpy(dtype=float, na_value=np.nan))
+            # Cada valor distinto é formatado uma vez e as células iguais compartilham a mesma str;
+            # o "" no fim da tabela atende o código -1
+            labels = np.array(list(map(fmt, uniques.tolist())) + [""], dtype=object)
+            return labels[codes].tolist()
+        
+        # Categorias: cada rótulo é convertido uma vez e as células são reunidas pelos códigos (-1 = nulo)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            labels = np.array(series.cat.categories.astype(str).tolist() + [""], dtype=object)
+            return labels[series.cat.codes.to_numpy()].tolist()
+        
+        # Colunas de texto já contêm str: dispensam a conversão elemento a elemento
+        if isinstance(series.dtype, pd.StringDtype):
+            return series.fillna("").tolist() if series.hasnans else series.tolist()
+        
+        return series.astype(str).mask(series.isna(), "").tolist()
+    
+    def _row_tags(self, data: pd.DataFrame) -> List[Tuple[str, ...]]:
+        """Calcula as tags de formatação condicional de todas as linhas com máscaras booleanas."""
+        n = len(data)
+        alerta = np.zeros(n, dtype=bool)
+        diff_state = np.zeros(n, dtype=np.int8)  # 0: sem tag, 1: excesso, 2: faltante
+        
+        if 'Flag' in data.columns:
+            # A comparação de texto roda só nos poucos valores distintos; o código -1 (nulo) cai no False final
+            flag = data['Flag']
+            if isinstance(flag.dtype, pd.CategoricalDtype):
+                codes, uniques = flag.cat.codes.to_numpy(), flag.cat.categories
+            else:
+                codes, uniques = pd.factorize(flag)
+            is_alerta = np.array([str(v).upper() == 'ALERTA!' for v in uniques] + [False])
+            alerta = is_alerta[codes]
+        if 'DIFERENCA' in data.columns and pd.api.types.is_numeric_dtype(data['DIFERENCA']):
+            diff = data['DIFERENCA'].to_numpy()
+            diff_state[diff > 0] = 1
+            diff_state[diff < 0] = 2
+        
+        # Uma única indexação NumPy escolhe a tupla de tags de cada linha
+        codes = diff_state * 2 + alerta
+        return _ROW_TAG_TABLE[codes].tolist()
     
     def _configure_style_tags(self):
         """Configura os estilos condicionais para a Treeview."""
@@ -364,6 +754,10 @@ class InventoryView(ttk.Frame):
         self.tree.tag_configure('oddrow', background='#f9f9f9')
         self.tree.tag_configure('evenrow', background='#ffffff')
     
+    def refresh_style(self):
+        """Reaplica as cores das tags sem recarregar os dados (as tags das linhas não mudam)."""
+        self._configure_style_tags()
+    
     def sort_by_column(self, column: str):
         """Ordena os dados pela coluna especificada."""
         if column not in [col.name for col in self.columns]:
@@ -380,8 +774,10 @@ class InventoryView(ttk.Frame):
             self._sort_column = column
             self._sort_direction = SortDirection.DESCENDING
         
-        if self.current_data is not None:
-            self.display_data(self.current_data)
+        # Reordena o pedido mais recente, não o frame antigo ainda exibido durante uma carga
+        source, token = self._latest_source()
+        if source is not None:
+            self.display_data(source, token)
             
         direction_symbol = "↓" if self._sort_direction == SortDirection.DESCENDING else "↑"
         self.sort_var.set(f"Ordenado por: {column} {direction_symbol}")
@@ -416,11 +812,11 @@ class InventoryView(ttk.Frame):
             return
             
         start_item = self.current_page * self.page_size + 1
-        end_item = min((self.current_page + 1) * self.page_size, len(self.current_data))
+        end_item = min((self.current_page + 1) * self.page_size, self._row_count)
         
         self.page_info.config(
             text=f"Página {self.current_page + 1}/{self.total_pages} "
-                 f"(Itens {start_item}-{end_item} de {len(self.current_data)})"
+                 f"(Itens {start_item}-{end_item} de {self._row_count})"
         )
     
     def _update_status(self, message: str, rows: Optional[int] = None, 
@@ -441,57 +837,125 @@ class InventoryView(ttk.Frame):
     
     def clear(self):
         """Limpa todos os dados da visualização."""
-        self.tree.delete(*self.tree.get_children())
+        self._cancel_pending_render()
+        # Pedidos ainda não exibidos não podem repovoar a visualização depois de limpa
+        if self._display_job is not None:
+            self.after_cancel(self._display_job)
+            self._display_job = None
+            self._discard_load()
+        self._queued_display = None
+        with self._load_condition:
+            # O resultado de um carregamento em curso no worker fica obsoleto e é descartado
+            self._load_generation += 1
+            self._inflight_load = None
+            if self._pending_load is not None:
+                self._pending_load = None
+                self._discard_load()
+        # _row_iids já guarda todos os itens da página: dispensa consultar get_children no Tcl
+        self.tree.delete(*[iid for iid in self._row_iids if iid is not None])
+        self._row_iids = []
         self.current_data = None
+        self.loaded_token = None
+        self._display_order = None
+        self._page_cache.clear()
         self.current_page = 0
         self.total_pages = 0
+        self._row_count = 0
         self._update_status("Pronto", rows=0)
         self.sort_var.set("")
         self._update_pagination_controls()
         self._update_page_info()
     
     def get_selected_rows(self) -> List[Dict[str, Any]]:
-        """Retorna as linhas selecionadas como dicionários."""
+        """Retorna as linhas selecionadas como dicionários.
+        
+        Os valores vêm das linhas formatadas da página em cache, sem uma consulta ao Tcl por item
+        selecionado, e mantêm os tipos de tree.item: textos inteiros viram int e os demais
+        continuam como o texto exibido. As tags vêm como lista (vazia se a linha não tiver tags).
+        
+        Returns:
+            Lista de {'id': item, 'values': {coluna: valor}, 'tags': [tag, ...]}
+        """
         try:
-            return [
-                {
+            # Itens reaproveitados ainda não atualizados exibiriam a página anterior
+            self._finish_pending_render()
+            rows = self._page_cache.get(self.current_page, [])
+            positions = {iid: i for i, iid in enumerate(self._row_iids) if iid is not None}
+            names = [col.name for col in self.columns]
+            selected = []
+            for item in self.tree.selection():
+                values, tags = rows[positions[item]]
+                selected.append({
                     'id': item,
-                    'values': dict(zip(
-                        [col.name for col in self.columns], 
-                        self.tree.item(item)['values']
-                    )),
-                    'tags': self.tree.item(item)['tags']
-                }
-                for item in self.tree.selection()
-            ]
+                    'values': dict(zip(names, map(self._as_tree_value, values))),
+                    'tags': list(tags)
+                })
+            return selected
         except Exception as e:
             self.logger.error(f"Erro ao obter seleção: {e}", exc_info=True)
             return []
     
+    @staticmethod
+    def _as_tree_value(text: str) -> Any:
+        """Converte um texto exibido como o ttk faz ao devolver os valores de um item."""
+        try:
+            return int(text)
+        except ValueError:
+            return text
+    
+    def destroy(self):
+        """Cancela etapas de inserção pendentes e encerra o worker antes de destruir o widget."""
+        self._cancel_pending_render()
+        if self._display_job is not None:
+            self.after_cancel(self._display_job)
+            self._display_job = None
+        with self._load_condition:
+            self._pending_load = None
+            self._stop_loading.set()
+            self._load_condition.notify()
+        super().destroy()
+    
     def is_updating(self) -> bool:
         """Verifica se há operações em andamento."""
         return self._pending_operations > 0
 
-    def refresh_from_file(self, file_path: Path):
-        """Atualiza a visualização diretamente de um arquivo parquet."""
+    def refresh_from_file(self, file_path: Path, token: Any = None):
+        """Atualiza a visualização diretamente de um arquivo parquet.
+        
+        Pode ser chamado fora da thread do Tk: a leitura acontece aqui e a exibição
+        é agendada na thread principal.
+        
+        Args:
+            file_path: Arquivo parquet a carregar
+            token: Repassado a display_data (ver loaded_token)
+        
+        Returns:
+            True se o arquivo foi lido e a exibição agendada; a carga em si termina depois,
+            com <<InventoryDataLoaded>>
+        """
         try:
             if not file_path.exists():
-                self.clear()
+                self.after(0, self.clear)
                 return False
                 
-            # Carrega apenas as colunas necessárias
-            cols = [col.name for col in self.columns]
-            df = pd.read_parquet(file_path, columns=cols)
+            # Carrega apenas as colunas exibidas que existem no arquivo, direto pelo pyarrow
+            # (arquivo mapeado em memória, leitura multithread)
+            available = set(pq.read_schema(file_path).names)
+            cols = [col.name for col in self.columns if col.name in available]
+            table = pq.read_table(file_path, columns=cols, memory_map=True, use_threads=True)
+            # Cada coluna vira um bloco próprio e a tabela Arrow é liberada durante a conversão
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
             
             # Garante todas as colunas esperadas
             for col in self.columns:
                 if col.name not in df.columns:
                     df[col.name] = '' if col.dtype == 'str' else 0
             
-            self.display_data(df)
+            self.after(0, self.display_data, df, token)
             return True
             
         except Exception as e:
             self.logger.error(f"Erro ao carregar arquivo: {e}", exc_info=True)
-            self._update_status(f"Erro ao carregar {file_path.name}", error=True)
+            self.after(0, lambda: self._update_status(f"Erro ao carregar {file_path.name}", error=True))
             return False
\ No newline at end of file
@@ -2,17 +2,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
-from typing import Optional, Dict, Callable
+from typing import Callable
 import logging
 import threading
-import os
-try:
-    from venv import logger # Este import pode causar conflito, mantido como no original
-except ImportError:
-    logger = logging # Fallback
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import time
 from core.inventory_manager import InventoryManager
 from core.file_processor import FileProcessor
 from core.data_combiner import DataCombiner
@@ -22,7 +18,7 @@ from ui.inventory_view import InventoryView
 from ui.import_dialog import ImportDialog
 from ui.progress_dialog import ProgressDialog
 from utils.logger import setup_logger
-from utils.validators import validate_inventory_name, validate_store_name
+from utils.validators import validate_inventory_name
 
 
 class MainWindow(tk.Tk):
@@ -37,7 +33,14 @@ class MainWindow(tk.Tk):
 
         # Variáveis de estado
         self.current_data = None
+        self._inv_index = {}  # Texto exibido no combobox -> caminho do inventário
         self.processing_lock = threading.Lock()
+        
+        # Pool único para I/O em background (evita criar uma thread por clique/atualização)
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hades-io")
+        self._refresh_future = None
+        self._refresh_pending = False
+        self._loaded_signature = None  # (arquivo, mtime_ns, tamanho) do último parquet exibido
         self.watcher_active = True
         self.last_backup_time = None
         
@@ -59,7 +62,8 @@ class MainWindow(tk.Tk):
         self.logger = setup_logger(
             "hades",
             log_file="inventario_hades.log",
-            level=logging.INFO
+            level=logging.INFO,
+            buffer_capacity=100
         )
         
         # Inicializa serviços
@@ -175,6 +179,8 @@ class MainWindow(tk.Tk):
         """Configura a área de visualização de dados"""
         self.inventory_view = InventoryView(self.main_frame)
         self.inventory_view.pack(fill=tk.BOTH, expand=True)
+        # As estatísticas só refletem os dados novos quando a view termina a carga
+        self.inventory_view.bind("<<InventoryDataLoaded>>", self._on_inventory_data_loaded)
 
     def _setup_statusbar(self):
         """Configura a barra de status inferior"""
@@ -372,13 +378,13 @@ class MainWindow(tk.Tk):
         )
 
     def import_new_data(self):
-        """Importa arquivo Excel com novos dados"""
+        """Importa um ou mais arquivos Excel com novos dados"""
         dialog = ImportDialog(self)
-        file_path = dialog.show()
-        if not file_path: return
+        file_paths = dialog.show()
+        if not file_paths: return
         
         self._run_operation_with_progress(
-            operation=lambda: self.file_processor.process_excel(file_path),
+            operation=lambda: self.file_processor.process_excel_files(file_paths),
             title="Processando Excel",
             message="Processando arquivo de contagem...",
             success_msg="Dados importados com sucesso!",
@@ -400,24 +406,49 @@ class MainWindow(tk.Tk):
         
         if not combined_file.exists():
             self.update_status("Inventário criado - Adicione os dados iniciais")
+            self._loaded_signature = None
             self.inventory_view.clear()
             return
         
-        threading.Thread(
-            target=lambda: self._refresh_data_task(combined_file),
-            daemon=True
-        ).start()
+        # Coalesce atualizações: se já há uma em andamento, agenda apenas mais uma ao final
+        if self._refresh_future is not None and not self._refresh_future.done():
+            self._refresh_pending = True
+            return
+        
+        # Arquivo inalterado desde a última leitura: os dados exibidos já estão atualizados
+        stat = combined_file.stat()
+        signature = (combined_file, stat.st_mtime_ns, stat.st_size)
+        if signature == self._loaded_signature and self.inventory_view.current_data is not None:
+            self._update_display_stats()
+            return
+        
+        # Só volta a valer quando o frame lido for de fato exibido (ver _on_inventory_data_loaded):
+        # se a carga for descartada ou rejeitada, a próxima atualização relê o arquivo
+        self._loaded_signature = None
+        self._refresh_future = self._io_pool.submit(self._refresh_data_task, combined_file, signature)
+        self._refresh_future.add_done_callback(lambda f: self.after(0, self._on_refresh_done))
+
+    def _on_refresh_done(self):
+        """Executa a atualização que chegou enquanto outra estava em andamento"""
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh_data()
 
-    def _refresh_data_task(self, file_path: Path):
+    def _refresh_data_task(self, file_path: Path, signature: tuple):
         """Tarefa de carregamento de dados em background"""
         try:
-            success = self.inventory_view.refresh_from_file(file_path)
-            self.after(0, self._update_display_stats if success else 
-                           lambda: self.update_status("Falha ao carregar dados"))
+            success = self.inventory_view.refresh_from_file(file_path, token=signature)
+            if not success:
+                self.after(0, lambda: self.update_status("Falha ao carregar dados"))
         except Exception as e:
             self.logger.error(f"Erro ao atualizar dados: {e}", exc_info=True)
             self.after(0, lambda: self.update_status(f"Erro: {str(e)}"))
 
+    def _on_inventory_data_loaded(self, event=None):
+        """Registra a assinatura do arquivo cujo frame acabou de ser exibido e atualiza as estatísticas"""
+        self._loaded_signature = self.inventory_view.loaded_token
+        self._update_display_stats()
+
     def _update_display_stats(self):
         """Atualiza as estatísticas de exibição na barra de status"""
         ### CORREÇÃO 2: Acessar a propriedade .current_data diretamente ###
@@ -434,9 +465,10 @@ class MainWindow(tk.Tk):
             return
             
         df = current_data
-        if 'DIFERENCA' in df.columns:
-            pos_diff = (df['DIFERENCA'] > 0).sum()
-            neg_diff = (df['DIFERENCA'] < 0).sum()
+        if 'DIFERENCA' in df.columns and pd.api.types.is_numeric_dtype(df['DIFERENCA']):
+            # Uma única passada: o sinal de cada diferença (-1, 0, 1) indexa um contador
+            signs = np.sign(df['DIFERENCA'].to_numpy(dtype=np.float64, na_value=0.0))
+            neg_diff, _, pos_diff = np.bincount(signs.astype(np.int8) + 1, minlength=3)
             status = (f"Dados carregados | Itens com excesso: {pos_diff} | "
                       f"Itens faltando: {neg_diff} | Total: {len(df)}")
         else:
@@ -497,17 +529,13 @@ class MainWindow(tk.Tk):
         selection = self.inventory_var.get()
         if not selection: return
         
-        # Parse do nome e loja para encontrar o caminho correto
-        name = selection.split(" - ")[0]
-        store = selection.split(" - ")[1].split(" (")[0]
+        # O índice é montado junto com a lista do combobox: sem reler os inventários do disco
+        path = self._inv_index.get(selection)
+        if path is None: return
         
-        inventories = self.inventory_manager.get_inventory_list()
-        for inv in inventories:
-            if inv['name'] == name and inv['store'] == store:
-                if self.inventory_manager.set_active_inventory(inv['path']):
-                    self.config_manager.set("inventory.active_path", inv['path'])
-                    self._update_ui_for_active_inventory()
-                break
+        if self.inventory_manager.set_active_inventory(path):
+            self.config_manager.set("inventory.active_path", path)
+            self._update_ui_for_active_inventory()
 
     def _run_operation_with_progress(self, operation: Callable, title: str, message: str,
                                      success_msg: str, error_msg: str):
@@ -532,17 +560,20 @@ class MainWindow(tk.Tk):
                 self.logger.error(f"Erro na operação '{title}': {e}", exc_info=True)
         
         progress.show()
-        threading.Thread(target=execute, daemon=True).start()
+        self._io_pool.submit(execute)
 
     def update_inventory_list(self):
         """Atualiza a lista de inventários no combobox"""
         inventories = self.inventory_manager.get_inventory_list()
         if inventories is None: return
         
-        display_items = [
-            f"{inv['name']} - {inv['store']} ({inv['created_at'][:10]})"
-            for inv in inventories
-        ]
+        display_items = []
+        inv_index = {}
+        for inv in inventories:
+            display_text = f"{inv['name']} - {inv['store']} ({inv['created_at'][:10]})"
+            display_items.append(display_text)
+            inv_index.setdefault(display_text, inv['path'])
+        self._inv_index = inv_index
         self.inventory_cb['values'] = display_items
 
     def update_status(self, message: str, error: bool = False):
@@ -552,10 +583,19 @@ class MainWindow(tk.Tk):
         else: self.logger.error(message)
 
     def center_window(self, window):
-        """Centraliza uma janela em relação à principal"""
-        window.update_idletasks()
-        width = window.winfo_width()
-        height = window.winfo_height()
+        """
+        Centraliza uma janela na tela. O tamanho pedido pela janela só é calculado
+        quando a UI fica ociosa, então o posicionamento é agendado para esse momento
+        em vez de forçar update_idletasks (que processaria toda a fila pendente).
+        """
+        window.after_idle(self._place_centered, window)
+
+    def _place_centered(self, window):
+        """Posiciona a janela no centro da tela a partir do tamanho pedido"""
+        if not window.winfo_exists():
+            return
+        width = window.winfo_reqwidth()
+        height = window.winfo_reqheight()
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
         window.geometry(f"+{x}+{y}")
@@ -675,6 +715,7 @@ class MainWindow(tk.Tk):
             except Exception as e:
                 self.logger.error(f"Erro ao salvar configuração ao fechar: {e}")
         
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
         self.destroy()
         self.logger.info("Aplicação encerrada.")
 
@@ -0,0 +1,71 @@
+#treeview_batch.py
+from tkinter import ttk
+from typing import Iterable, List, Sequence, Tuple, Union
+
+# Procedimentos Tcl que inserem/atualizam um lote de linhas do Treeview em uma única chamada.
+# Cada linha é uma lista {values tags}; a inserção retorna os ids dos itens criados, na ordem.
+_INSERT_PROC = "::hades::tree_insert"
+_UPDATE_PROC = "::hades::tree_update"
+_PROCS_BODY = """
+namespace eval ::hades {}
+proc ::hades::tree_insert {tree parent index rows} {
+    set ids {}
+    foreach row $rows {
+        lassign $row values tags
+        lappend ids [$tree insert $parent $index -values $values -tags $tags]
+    }
+    return $ids
+}
+proc ::hades::tree_update {tree ids rows} {
+    foreach id $ids row $rows {
+        lassign $row values tags
+        $tree item $id -values $values -tags $tags
+    }
+}
+"""
+
+Row = Tuple[Sequence[Union[str, int, float]], Sequence[str]]
+
+
+def _ensure_procs(tree: ttk.Treeview):
+    """Define os procedimentos de lote no interpretador Tcl do widget (uma vez por interpretador)"""
+    if not tree.tk.call("info", "commands", _UPDATE_PROC):
+        tree.tk.eval(_PROCS_BODY)
+
+
+def _as_batch(rows: Iterable[Row]) -> Sequence[Row]:
+    """
+    Materializa o lote sem copiar linha a linha: o tkinter converte tuplas e listas aninhadas
+    direto em listas Tcl, então só iteráveis avulsos (geradores) precisam virar tupla.
+    """
+    return rows if isinstance(rows, (tuple, list)) else tuple(rows)
+
+
+def insert_rows(tree: ttk.Treeview, rows: Iterable[Row], parent: str = "", index: Union[int, str] = "end") -> List[str]:
+    """
+    Insere várias linhas (values, tags) no Treeview com uma única travessia Python→Tcl,
+    em vez de uma chamada de `tree.insert` (e seu pós-processamento) por linha.
+    O lote é passado como lista Tcl nativa, sem montar scripts em texto (sem problemas de escape).
+
+    Returns:
+        List[str]: ids dos itens inseridos, na mesma ordem das linhas
+    """
+    rows = _as_batch(rows)
+    if not rows:
+        return []
+    _ensure_procs(tree)
+    ids = tree.tk.call(_INSERT_PROC, tree._w, parent, index, rows)
+    return list(tree.tk.splitlist(ids))
+
+
+def update_rows(tree: ttk.Treeview, item_ids: Sequence[str], rows: Iterable[Row]):
+    """
+    Substitui valores e tags de itens já existentes com uma única chamada Tcl,
+    reaproveitando os itens em vez de removê-los e criá-los de novo.
+    `item_ids` e `rows` são pareados na ordem dada.
+    """
+    rows = _as_batch(rows)
+    if not rows:
+        return
+    _ensure_procs(tree)
+    tree.tk.call(_UPDATE_PROC, tree._w, tuple(item_ids), rows)
@@ -1,11 +1,10 @@
 #virtual_treeview.py
-import tkinter as tk
 from tkinter import ttk
 import pandas as pd
-from typing import Optional, List, Dict, Any
 import logging
 import threading
 from queue import Queue
+from ui.treeview_batch import insert_rows
 
 class VirtualTreeview(ttk.Treeview):
     def __init__(self, master, page_size=1000, **kwargs):
@@ -29,8 +28,8 @@ class VirtualTreeview(ttk.Treeview):
         self._sort_reverse = False
         
         # Configura eventos
+        # A página não depende do tamanho do widget: redimensionar não a reinsere
         self.bind("<MouseWheel>", self._on_scroll)
-        self.bind("<Configure>", self._update_display)
         
     def set_data(self, data: pd.DataFrame):
         """Define os dados a serem exibidos"""
@@ -40,7 +39,7 @@ class VirtualTreeview(ttk.Treeview):
         self.current_page = 0
         self._update_display()
         
-    def _update_display(self, event=None):
+    def _update_display(self):
         """Atualiza a exibição com os dados da página atual"""
         if self._data is None:
             return
@@ -54,9 +53,13 @@ class VirtualTreeview(ttk.Treeview):
         
         # Adiciona os itens da página atual
         page_data = self._data.iloc[start_idx:end_idx]
-        for _, row in page_data.iterrows():
-            values = [str(row[col]) if col in row else "" for col in self['columns']]
-            self.insert("", "end", values=values)
+        # Cada coluna é convertida uma única vez; as linhas são montadas a partir das listas de colunas
+        blank = [""] * len(page_data)
+        columns = [
+            page_data[col].astype(str).tolist() if col in page_data.columns else blank
+            for col in self['columns']
+        ]
+        insert_rows(self, [(values, ()) for values in zip(*columns)])
             
     def _on_scroll(self, event):
         """Lida com o evento de scroll para mudar de página"""
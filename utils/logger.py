@@ -3,7 +3,7 @@ import logging
 import os
 from pathlib import Path
 from typing import Optional, Union
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, MemoryHandler
 
 def setup_logger(
     name: str,
@@ -11,7 +11,8 @@ def setup_logger(
     level: Union[str, int] = logging.INFO,
     log_format: Optional[str] = None,
     max_bytes: int = 5 * 1024 * 1024,  # 5MB
-    backup_count: int = 3
+    backup_count: int = 3,
+    buffer_capacity: int = 0
 ) -> logging.Logger:
     """
     Configura e retorna um logger avançado para o sistema HADES.
@@ -23,6 +24,9 @@ def setup_logger(
         log_format (str, opcional): Formato personalizado para as mensagens de log
         max_bytes (int): Tamanho máximo do arquivo de log antes de rotacionar (em bytes)
         backup_count (int): Número de arquivos de backup a manter
+        buffer_capacity (int): Quantidade de registros acumulados em memória antes de gravar
+            no arquivo. 0 grava cada registro imediatamente. Registros WARNING ou superiores
+            sempre forçam a gravação, e o buffer é descarregado ao encerrar a aplicação.
     
     Retorna:
         logging.Logger: Objeto logger configurado
@@ -70,7 +74,16 @@ def setup_logger(
                 encoding='utf-8'
             )
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            
+            # Agrupa as gravações em lote para evitar um write() por mensagem
+            if buffer_capacity > 0:
+                logger.addHandler(MemoryHandler(
+                    capacity=buffer_capacity,
+                    flushLevel=logging.WARNING,
+                    target=file_handler
+                ))
+            else:
+                logger.addHandler(file_handler)
             
             logger.debug(f"Handler de arquivo configurado para {log_file} "
                         f"com rotação a cada {max_bytes} bytes, "